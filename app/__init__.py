@@ -1,5 +1,16 @@
-from .run import create_app
+_app = None
 
-# Create and expose both the Dash app and its underlying Flask server
-app = create_app()
-server = app.server
\ No newline at end of file
+
+def __getattr__(name):
+    # The Dash app is built on first access (e.g. gunicorn's `app:server`),
+    # so importing a submodule such as app.event_pricing stays cheap.
+    global _app
+    if name == 'create_app':
+        from .run import create_app
+        return create_app
+    if name in ('app', 'server'):
+        if _app is None:
+            from .run import create_app
+            _app = create_app()
+        return _app if name == 'app' else _app.server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,4 @@
+from .event_pricing_api import register_event_pricing_api
+from .hedging_api import register_hedging_api
+
+__all__ = ['register_event_pricing_api', 'register_hedging_api']
@@ -0,0 +1,58 @@
+from functools import lru_cache
+from flask import jsonify, request, url_for
+from ..config import BATCH_JOB_DIR, BATCH_MAX_WORKERS, BATCH_TIMEOUT
+
+
+def register_event_pricing_api(app):
+    server = app.server
+
+    @lru_cache(maxsize=1)
+    def get_jobs():
+        # One job runner per process, created on first use
+        from ..event_pricing.jobs import BatchJobs
+        return BatchJobs(BATCH_JOB_DIR, max_workers=BATCH_MAX_WORKERS, timeout=BATCH_TIMEOUT)
+
+    # Batch pricing: {"underlyings": [...], "timeout": 60, "chunk_size": 25}
+    # See app.event_pricing.batch.parse_underlying for the entry format.
+    # Answers 202 with a job id at once; poll the Location for the results.
+    @server.route('/api/event-pricing/batch', methods=['POST'])
+    def event_pricing_batch():
+        from ..event_pricing.batch import DEFAULT_CHUNK_SIZE
+
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get('underlyings'), list):
+            return jsonify({'error': "Expected a JSON object with an 'underlyings' list"}), 400
+        try:
+            timeout = float(body.get('timeout', BATCH_TIMEOUT))
+            chunk_size = max(1, int(body.get('chunk_size', DEFAULT_CHUNK_SIZE)))
+            job_id = get_jobs().submit(body['underlyings'], chunk_size=chunk_size, timeout=timeout)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        location = url_for('event_pricing_batch_status', job_id=job_id)
+        return jsonify({'job_id': job_id, 'status': 'queued', 'location': location}), 202, {'Location': location}
+
+    # Batch job state: {"status": "queued" | "running" | "done" | "failed", "results" | "error": ...}
+    @server.route('/api/event-pricing/batch/<job_id>', methods=['GET'])
+    def event_pricing_batch_status(job_id):
+        state = get_jobs().status(job_id)
+        if state is None:
+            return jsonify({'error': f"Unknown batch job: {job_id}"}), 404
+        return jsonify(state)
+
+    # Sensitivities of one underlying: {"underlying": {...}, "bumps": {"ann_vol": 0.01, ...}}
+    # Bumps are optional and default to app.event_pricing.sensitivity.DEFAULT_BUMPS.
+    @server.route('/api/event-pricing/sensitivities', methods=['POST'])
+    def event_pricing_sensitivities():
+        from ..event_pricing import EventPricing
+        from ..event_pricing.batch import parse_underlying
+        from ..event_pricing.sensitivity import sensitivities
+
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get('underlying'), dict):
+            return jsonify({'error': "Expected a JSON object with an 'underlying' object"}), 400
+        try:
+            bumps = {k: float(v) for k, v in (body.get('bumps') or {}).items()}
+            table = sensitivities(EventPricing(**parse_underlying(body['underlying'])), bumps or None)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({'id': body['underlying']['id'], 'sensitivities': table.to_dict('records')})
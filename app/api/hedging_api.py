@@ -0,0 +1,37 @@
+import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from typing import TYPE_CHECKING, Callable
+from flask import Response, jsonify, request, stream_with_context
+from ..callbacks.hedging_callbacks import filter_positions
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def register_hedging_api(app, get_positions: Callable[[], 'pd.DataFrame']):
+    server = app.server
+
+    # Child-order schedule from now to the cutoff as a streamed CSV:
+    # ?style=VWAP&date=2025-04-17&time=16:00&tz=Europe/Paris[&market=US][&book=Book1&book=Book2]
+    # The cutoff is in the user's timezone `tz` (default: the server's) and is
+    # converted into each market's local time by the scheduler.
+    @server.route('/api/hedging/schedule.csv', methods=['GET'])
+    def hedging_schedule():
+        from ..execution import iter_schedule_csv, schedule_orders
+
+        args = request.args
+        try:
+            tz = ZoneInfo(args['tz']) if args.get('tz') else datetime.datetime.now().astimezone().tzinfo
+            cutoff = datetime.datetime.combine(datetime.date.fromisoformat(args.get('date', '')[:10]),
+                                               datetime.time.fromisoformat(args.get('time', '16:00')), tzinfo=tz)
+            now = datetime.datetime.now(datetime.timezone.utc)
+            positions = filter_positions(get_positions(), args.get('market'), args.getlist('book'))
+            style = args.get('style', 'VWAP')
+            schedule_orders(positions.iloc[:1], style=style, cutoff=cutoff, start=now)  # fail fast on bad inputs
+        except ZoneInfoNotFoundError:
+            return jsonify({'error': f"Unknown timezone: {args['tz']}"}), 400
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        rows = iter_schedule_csv(positions, style=style, cutoff=cutoff, start=now)
+        return Response(stream_with_context(rows), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=hedge_schedule.csv'})
@@ -0,0 +1,24 @@
+// Pure-UI callbacks that need no server round trip (registered with
+// ClientsideFunction(namespace='ui', ...) in app/callbacks/).
+(function () {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        ui: {
+            // Sidebar section collapse
+            toggle: function (n_clicks, is_open) {
+                return n_clicks ? !is_open : is_open;
+            },
+            // Hedging: streaming schedule export for the current selections
+            scheduleLink: function (style, date, time, market, books) {
+                const params = new URLSearchParams();
+                params.append('style', style || 'Limit on Close');
+                params.append('date', (date || '').slice(0, 10));
+                params.append('time', time || '16:00');
+                // The cutoff is the user's wall-clock time: the server converts it per market
+                params.append('tz', Intl.DateTimeFormat().resolvedOptions().timeZone);
+                if (market) { params.append('market', market); }
+                (books || []).forEach(book => params.append('book', book));
+                return '/api/hedging/schedule.csv?' + params.toString();
+            },
+        },
+    });
+})();
@@ -0,0 +1,36 @@
+// Revalidate Dash callback requests with If-None-Match: when the server
+// answers 304 (output unchanged), reuse the body we already hold for that
+// callback instead of downloading it again. See app/utils/http_cache.py.
+(function () {
+    const ENDPOINT = '_dash-update-component';
+    const lastResponse = new Map();  // callback output id -> {etag, body}
+    const originalFetch = window.fetch.bind(window);
+
+    window.fetch = async function (input, init) {
+        const url = typeof input === 'string' ? input : input.url;
+        if (!url.includes(ENDPOINT) || !init || typeof init.body !== 'string') {
+            return originalFetch(input, init);
+        }
+        let output;
+        try {
+            output = JSON.parse(init.body).output;
+        } catch (e) {
+            return originalFetch(input, init);
+        }
+        const cached = lastResponse.get(output);
+        if (cached) {
+            init = Object.assign({}, init, {
+                headers: Object.assign({}, init.headers, {'If-None-Match': cached.etag})
+            });
+        }
+        const response = await originalFetch(input, init);
+        if (response.status === 304 && cached) {
+            return new Response(cached.body, {status: 200, headers: {'Content-Type': 'application/json'}});
+        }
+        const etag = response.headers.get('ETag');
+        if (response.ok && etag) {
+            lastResponse.set(output, {etag: etag, body: await response.clone().text()});
+        }
+        return response;
+    };
+})();
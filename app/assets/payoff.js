@@ -0,0 +1,64 @@
+// Expiry payoff diagrams of common option structures, computed in the browser.
+// Used by the clientside payoff chart callback (app/callbacks/event_pricing_callbacks.py).
+(function () {
+    function linspace(start, stop, n) {
+        const step = (stop - start) / (n - 1);
+        return Array.from({length: n}, (_, i) => start + i * step);
+    }
+
+    const call = (S, K) => Math.max(S - K, 0);
+    const put = (S, K) => Math.max(K - S, 0);
+
+    // Long ATM call + long ATM put
+    const straddle = (S, k) => call(S, k.atm) + put(S, k.atm);
+    // Long OTM put + long OTM call
+    const strangle = (S, k) => put(S, k.put) + call(S, k.call);
+    // Long OTM call, short OTM put
+    const riskReversal = (S, k) => call(S, k.call) - put(S, k.put);
+
+    const STRATEGIES = {
+        straddle: {label: 'Straddle', payoff: straddle},
+        strangle: {label: 'Strangle', payoff: strangle},
+        risk_reversal: {label: 'Risk Reversal', payoff: riskReversal},
+    };
+
+    // Put/call strikes from the Pre row of the pricing summary, else spot -/+ 10%
+    function strikes(s0, summary) {
+        const k = {atm: s0, put: 0.9 * s0, call: 1.1 * s0};
+        const pre = (summary || [])[0] || {};
+        for (const [name, value] of Object.entries(pre)) {
+            if (name.endsWith('Put Strike')) { k.put = parseFloat(value); }
+            if (name.endsWith('Call Strike')) { k.call = parseFloat(value); }
+        }
+        return k;
+    }
+
+    function payoff(strategy, s0, summary, n) {
+        const k = strikes(s0, summary);
+        const x = linspace(0.5 * s0, 1.5 * s0, n || 100);
+        return {x: x, y: x.map(S => STRATEGIES[strategy].payoff(S, k))};
+    }
+
+    function chart(summary, strategy, s0, style) {
+        s0 = parseFloat(s0);
+        if (!summary || !summary.length || !(s0 > 0)) {
+            return window.dash_clientside.no_update;
+        }
+        strategy = STRATEGIES[strategy] ? strategy : 'straddle';
+        const {x, y} = payoff(strategy, s0, summary);
+        return {
+            data: [{type: 'scatter', x: x, y: y, mode: 'lines', line: {color: style.color}}],
+            layout: {
+                title: {text: STRATEGIES[strategy].label + ' Payoff Diagram'},
+                xaxis: {title: {text: 'Underlying Price'}},
+                yaxis: {title: {text: 'Payoff'}},
+                template: style.template,
+            },
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        payoff: {straddle: straddle, strangle: strangle, riskReversal: riskReversal,
+                 strikes: strikes, payoff: payoff, chart: chart},
+    });
+})();
@@ -1,8 +1,42 @@
-from dash import Input, Output, no_update
+from dash import ClientsideFunction, Input, Output, State, no_update
 import numpy as np
 import plotly.graph_objects as go
-from ..event_pricing import EventPricing
-from ..config import PRIMARY, SECONDARY, BACKGROUND
+from ..config import PRIMARY, SECONDARY, SNAPSHOT_DIR
+from ..utils.figures import LIGHT_TEMPLATE
+from ..utils.metrics import record_cache
+
+EVENT_INPUTS = [
+    Input('compute-btn', 'n_clicks'), Input('input-s0', 'value'), Input('input-ann-vol', 'value'),
+    Input('input-r', 'value'), Input('input-q', 'value'), Input('input-normal-days', 'value'),
+    Input('input-non-tdays', 'value'), Input('input-event-days', 'value'),
+    Input('input-event-multiplier', 'value'), Input('input-prob-up', 'value'),
+    Input('input-target-delta', 'value')
+]
+# The form values without the button
+EVENT_STATES = [State(i.component_id, i.component_property) for i in EVENT_INPUTS[1:]]
+
+
+def event_params(s0, ann_vol_pct, r_pct, q_pct, normal_days, non_tdays, event_days,
+                 event_multiplier, prob_up_pct, target_delta_pct) -> dict:
+    """EventPricing keyword arguments from the form values (percentages as entered)."""
+    return dict(
+        S0=float(s0), ann_vol=float(ann_vol_pct) / 100, r=float(r_pct) / 100, q=float(q_pct) / 100,
+        normal_days=int(normal_days), non_tdays=int(non_tdays),
+        event_days=int(event_days), event_multiplier=float(event_multiplier),
+        prob_up=float(prob_up_pct) / 100, target_delta=float(target_delta_pct) / 100
+    )
+
+
+def tornado_figure(table, instrument: str = 'Post Straddle') -> go.Figure:
+    """Down/up bump P&L of one instrument per parameter, widest range on top."""
+    rows = table[table['Instrument'] == instrument]
+    rows = rows.assign(Range=(rows['Δ Up'] - rows['Δ Down']).abs()).sort_values('Range')
+    labels = [f"{p} ±{b:g}" for p, b in zip(rows['Parameter'], rows['Bump'])]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=labels, x=rows['Δ Down'].to_numpy(), orientation='h', name='Down', marker_color=SECONDARY))
+    fig.add_trace(go.Bar(y=labels, x=rows['Δ Up'].to_numpy(), orientation='h', name='Up', marker_color=PRIMARY))
+    fig.update_layout(barmode='overlay', title=f'{instrument} Sensitivity', xaxis_title='Change in Price', template=LIGHT_TEMPLATE)
+    return fig
 
 
 def register_event_pricing_callbacks(app):
@@ -10,85 +44,108 @@ def register_event_pricing_callbacks(app):
         [
             Output('output-vol', 'children'), Output('output-table', 'data'), Output('output-table', 'columns'),
             Output('output-iv-chart', 'figure'), Output('output-premium-chart', 'figure'),
-            Output('output-price-comp-chart', 'figure'), Output('output-straddle-payoff-chart', 'figure'),
+            Output('output-price-comp-chart', 'figure'),
             Output('output-skew-chart', 'figure'), Output('output-distribution-chart', 'figure')
         ],
-        [
-            Input('compute-btn', 'n_clicks'), Input('input-s0', 'value'), Input('input-ann-vol', 'value'),
-            Input('input-r', 'value'), Input('input-q', 'value'), Input('input-normal-days', 'value'),
-            Input('input-non-tdays', 'value'), Input('input-event-days', 'value'),
-            Input('input-event-multiplier', 'value'), Input('input-prob-up', 'value'),
-            Input('input-target-delta', 'value')
-        ]
+        EVENT_INPUTS
     )
     def update_event_pricing(n_clicks, s0, ann_vol_pct, r_pct, q_pct,
                              normal_days, non_tdays, event_days,
                              event_multiplier, prob_up_pct, target_delta_pct):
         if not n_clicks:
-            return [no_update] * 9
+            return [no_update] * 8
         
-        ann_vol = float(ann_vol_pct) / 100
-        r = float(r_pct) / 100
-        q = float(q_pct) / 100
-        prob_up = float(prob_up_pct) / 100
-        target_delta = float(target_delta_pct) / 100
-        
-        # Instantiate
-        ep = EventPricing(
-            S0=float(s0), ann_vol=ann_vol, r=r, q=q,
-            normal_days=int(normal_days), non_tdays=int(non_tdays),
-            event_days=int(event_days), event_multiplier=float(event_multiplier),
-            prob_up=prob_up, target_delta=target_delta
-        )
+        params = event_params(s0, ann_vol_pct, r_pct, q_pct, normal_days, non_tdays, event_days,
+                              event_multiplier, prob_up_pct, target_delta_pct)
+        target_delta = params['target_delta']
+        # Imported on first Compute: pulls in scipy and pandas
+        from ..event_pricing.snapshot import event_pricing_results, get_snapshot
+        # Exact matches of the nightly universe come from the snapshot; custom inputs are priced live
+        results, hit = event_pricing_results(params, get_snapshot(SNAPSHOT_DIR))
+        record_cache('event_snapshot', hit)
 
-        vol_text = f"{ep.eff_vol:.2%}"
-        df_sum = ep.summary()
-        df_sum.columns = ["Scenario", "Forward Price", "Straddle Price", f"{target_delta}Δ Put Strike", f"{target_delta}Δ Put Price", f"{target_delta}Δ Call Strike", f"{target_delta}Δ Call Price"]
-        df_sum = df_sum.applymap(lambda x: f"{x:.4f}" if isinstance(x,(float,int)) else x)
-        data = df_sum.to_dict('records')
-        cols = [{'name': c,'id': c} for c in df_sum.columns]
+        vol_text = f"{results['eff_vol']:.2%}"
+        names = ["Scenario", "Forward Price", "Straddle Price", f"{target_delta}Δ Put Strike", f"{target_delta}Δ Put Price", f"{target_delta}Δ Call Strike", f"{target_delta}Δ Call Price"]
+        data = [{name: f"{x:.4f}" if isinstance(x, (float, int)) else x for name, x in zip(names, row.values())}
+                for row in results['summary']]
+        cols = [{'name': c,'id': c} for c in names]
 
         # Implied vol shift chart
-        df_iv = ep.iv_shift()
+        iv_shift = results['iv_shift']
+        options = [row['Option'] for row in iv_shift]
         fig_iv = go.Figure()
-        fig_iv.add_trace(go.Bar(x=df_iv['Option'], y=df_iv['IV Pre (%)'], name='IV Pre', marker_color=SECONDARY))
-        fig_iv.add_trace(go.Bar(x=df_iv['Option'], y=df_iv['IV Post (%)'], name='IV Post', marker_color=PRIMARY))
-        fig_iv.update_layout(barmode='group', title='Implied Volatility Shift', template='plotly_white')
+        fig_iv.add_trace(go.Bar(x=options, y=[row['IV Pre (%)'] for row in iv_shift], name='IV Pre', marker_color=SECONDARY))
+        fig_iv.add_trace(go.Bar(x=options, y=[row['IV Post (%)'] for row in iv_shift], name='IV Post', marker_color=PRIMARY))
+        fig_iv.update_layout(barmode='group', title='Implied Volatility Shift', template=LIGHT_TEMPLATE)
 
         # Premium % change chart
-        df_prem = ep.premium_pct_change()
-        fig_prem = go.Figure(go.Bar(x=df_prem['Option'], y=df_prem['PctChange'], marker_color=SECONDARY))
-        fig_prem.update_layout(title='Premium % Change (Post vs. Pre)', template='plotly_white')
+        premium = results['premium_change']
+        fig_prem = go.Figure(go.Bar(x=[row['Option'] for row in premium], y=[row['PctChange'] for row in premium], marker_color=SECONDARY))
+        fig_prem.update_layout(title='Premium % Change (Post vs. Pre)', template=LIGHT_TEMPLATE)
 
         # Forward price vs straddle price chart
+        scenarios = [row['Scenario'] for row in data]
         fig_price_comp = go.Figure()
-        fig_price_comp.add_trace(go.Bar(x=df_sum['Scenario'], y=[float(x) for x in df_sum['Forward Price']], name='Forward Price', marker_color=PRIMARY))
-        fig_price_comp.add_trace(go.Bar(x=df_sum['Scenario'], y=[float(x) for x in df_sum['Straddle Price']], name='Straddle Price', marker_color=SECONDARY))
-        fig_price_comp.update_layout(barmode='group', title='Forward vs Straddle Price', template='plotly_white')
-
-        # Straddle payoff chart
-        S_range = np.linspace(float(s0)*0.5, float(s0)*1.5, 100)
-        payoff = np.abs(S_range - float(s0))
-        fig_payoff = go.Figure(go.Scatter(x=S_range, y=payoff, mode='lines', line={'color': SECONDARY}))
-        fig_payoff.update_layout(title='Straddle Payoff Diagram', xaxis_title='Underlying Price', yaxis_title='Payoff', template='plotly_white')
+        fig_price_comp.add_trace(go.Bar(x=scenarios, y=[float(row['Forward Price']) for row in data], name='Forward Price', marker_color=PRIMARY))
+        fig_price_comp.add_trace(go.Bar(x=scenarios, y=[float(row['Straddle Price']) for row in data], name='Straddle Price', marker_color=SECONDARY))
+        fig_price_comp.update_layout(barmode='group', title='Forward vs Straddle Price', template=LIGHT_TEMPLATE)
 
         # Skew chart
-        moneyness, ivs_pre, ivs_post = ep.skew()
+        skew = results['skew']
         fig_skew = go.Figure()
-        fig_skew.add_trace(go.Scatter(x=moneyness, y=ivs_pre, mode='lines', name='Pre', line={'color': SECONDARY}))
-        fig_skew.add_trace(go.Scatter(x=moneyness, y=ivs_post, mode='lines', name='Post', line={'color': PRIMARY}))
+        # numpy arrays are sent as compact base64 typed arrays rather than lists of decimals
+        fig_skew.add_trace(go.Scatter(x=np.asarray(skew['moneyness']), y=np.asarray(skew['iv_pre'], dtype=float), mode='lines', name='Pre', line={'color': SECONDARY}))
+        fig_skew.add_trace(go.Scatter(x=np.asarray(skew['moneyness']), y=np.asarray(skew['iv_post'], dtype=float), mode='lines', name='Post', line={'color': PRIMARY}))
         fig_skew.update_layout(
             title='Implied Volatility Skew',
             xaxis_title='Moneyness', yaxis_title='Implied Vol (%)',
             yaxis=dict(rangemode='tozero'),
-            template='plotly_white',
+            template=LIGHT_TEMPLATE,
         )
 
         # Implied vs lognormal distribution chart
-        x, pdf_implied, pdf_lognormal = ep.pdf()
+        pdf = results['pdf']
+        x = np.asarray(pdf['strikes'])
         fig_distribution = go.Figure()
-        fig_distribution.add_trace(go.Scatter(x=x, y=pdf_implied, mode='lines', name='Implied', line={'color': PRIMARY}))
-        fig_distribution.add_trace(go.Scatter(x=x, y=pdf_lognormal, mode='lines', name='Lognormal', line={'color': SECONDARY, 'dash': 'dot'}))
-        fig_distribution.update_layout(title="Probability Density Function (Implied vs Lognormal)", xaxis_title='Strike', yaxis_title='Density', template='plotly_white')
+        fig_distribution.add_trace(go.Scatter(x=x, y=np.asarray(pdf['implied'], dtype=float), mode='lines', name='Implied', line={'color': PRIMARY}))
+        fig_distribution.add_trace(go.Scatter(x=x, y=np.asarray(pdf['lognormal'], dtype=float), mode='lines', name='Lognormal', line={'color': SECONDARY, 'dash': 'dot'}))
+        fig_distribution.update_layout(title="Probability Density Function (Implied vs Lognormal)", xaxis_title='Strike', yaxis_title='Density', template=LIGHT_TEMPLATE)
+
+        return (vol_text, data, cols, fig_iv, fig_prem, fig_price_comp, fig_skew, fig_distribution)
+
+    # Payoff diagrams are drawn in the browser (assets/payoff.js) from the pricing summary
+    app.clientside_callback(
+        ClientsideFunction(namespace='payoff', function_name='chart'),
+        Output('output-straddle-payoff-chart', 'figure'),
+        Input('output-table', 'data'),
+        Input('payoff-strategy', 'value'),
+        State('input-s0', 'value'),
+        State('payoff-style', 'data'),
+    )
+
+    # Runs once the pricing table is filled, so the base valuation is there to reuse
+    @app.callback(
+        [Output('output-sensitivity-table', 'data'), Output('output-sensitivity-table', 'columns'),
+         Output('output-tornado-chart', 'figure')],
+        Input('output-table', 'data'),
+        EVENT_STATES
+    )
+    def update_sensitivities(summary, *values):
+        if not summary:
+            return [no_update] * 3
+
+        from ..event_pricing import EventPricing
+        from ..event_pricing.sensitivity import sensitivities
+        from ..event_pricing.snapshot import get_snapshot
 
-        return (vol_text, data, cols, fig_iv, fig_prem, fig_price_comp, fig_payoff, fig_skew, fig_distribution)
\ No newline at end of file
+        params = event_params(*values)
+        # Reuse the snapshot's base valuation when there is one; off the grid,
+        # sensitivities() prices its own base (far cheaper than event_results with curves)
+        snapshot = get_snapshot(SNAPSHOT_DIR)
+        row = snapshot.lookup(params) if snapshot is not None else None
+        # All bumps are priced in one vectorized call
+        table = sensitivities(EventPricing(**params), base=row['summary'] if row is not None else None)
+        shown = table.drop(columns=['Up', 'Down'])
+        data = shown.map(lambda x: f"{x:.4f}" if isinstance(x, float) else x).to_dict('records')
+        cols = [{'name': c, 'id': c} for c in shown.columns]
+        return data, cols, tornado_figure(table)
@@ -1,8 +1,24 @@
-import pandas as pd
-from dash import dcc, Input, Output, State, callback_context
+from typing import TYPE_CHECKING, Callable
+from dash import dcc, ClientsideFunction, Input, Output, State, callback_context
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def register_hedging_callbacks(app, positions: pd.DataFrame):
+
+def filter_positions(positions: 'pd.DataFrame', selected_market=None, selected_books=None) -> 'pd.DataFrame':
+    """Filter positions by market and (multi-select) books."""
+    df = positions
+    # Filter by market
+    if selected_market:
+        df = df[df['Market'] == selected_market]
+    # Filter by books (multi-select)
+    if selected_books:
+        books = (selected_books if isinstance(selected_books, (list, tuple)) else [selected_books])
+        df = df[df['Book'].isin(books)]
+    return df
+
+
+def register_hedging_callbacks(app, get_positions: Callable[[], 'pd.DataFrame']):
     # Callback for Hedge Table
     @app.callback(
         [
@@ -33,14 +49,7 @@ def register_hedging_callbacks(app, positions: pd.DataFrame):
             return {'display': 'none'}, [], default_market, default_books
         
         if triggered_id in ('generate-btn', 'mkt-dropdown', 'book-dropdown'):
-            df = positions.copy()
-            # Filter by market
-            if selected_market:
-                df = df[df['Market'] == selected_market]
-            # Fitler by books (multi-select)
-            if selected_books:
-                books = (selected_books if isinstance(selected_books, (list, tuple)) else [selected_books])
-                df = df[df['Book'].isin(books)]
+            df = filter_positions(get_positions(), selected_market, selected_books)
             # If no rows after filtering, hide table but keep dropdown selections
             if df.empty:
                 return {'display': 'none'}, [], selected_market, selected_books
@@ -81,10 +90,18 @@ def register_hedging_callbacks(app, positions: pd.DataFrame):
     )
     def download_orders(n_clicks, selected_market, selected_books):
         # when clicked, package the master df as CSV
-        df = positions.copy()
-        if selected_market:
-            df = df[df['Market'] == selected_market]
-        if selected_books:
-            books = (selected_books if isinstance(selected_books, (list, tuple)) else [selected_books])
-            df = df[df['Book'].isin(books)]
-        return dcc.send_data_frame(df.to_csv, "hedge_orders.csv", index=False)
\ No newline at end of file
+        from ..utils.data_loader import export_positions
+
+        df = export_positions(filter_positions(get_positions(), selected_market, selected_books))
+        return dcc.send_data_frame(df.to_csv, "hedge_orders.csv", index=False)
+
+    # Point the schedule link at the streaming export for the current selections
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='scheduleLink'),
+        Output('download-schedule-link', 'href'),
+        Input('style-dropdown', 'value'),
+        Input('hedge-date', 'date'),
+        Input('hedge-time', 'value'),
+        Input('mkt-dropdown', 'value'),
+        Input('book-dropdown', 'value'),
+    )
@@ -1,38 +1,45 @@
-from dash import Input, Output, State, callback_context, html
-from ..layouts.event_pricing_layout import event_pricing_layout
-from ..layouts.hedging_layout import hedging_layout
-from ..layouts.event_pricing_layout import event_pricing_layout
-from ..layouts.hedging_layout import hedging_layout
-from ..layouts.pnl_analytics_layout import pnl_analytics_layout
+import datetime
+from dash import ClientsideFunction, Input, Output, State, callback_context, html
+from ..config import LAYOUT_CACHE_SIZE
+from ..utils.http_cache import LRUDict
+from ..utils.metrics import record_cache
 
 
-def register_navigation_callbacks(app, positions):
-    # Toggle Research collapse
-    @app.callback(
-        Output("collapse-research", "is_open"),
-        [Input("tab-research", "n_clicks")],
-        [State("collapse-research", "is_open")]
-    )
-    def toggle_research(n, is_open):
-        return not is_open if n else is_open
+def register_navigation_callbacks(app, get_positions):
+    # Sidebar collapses toggle in the browser (assets/clientside.js): no server round trip
+    for section in ('research', 'execution', 'riskpnl'):
+        app.clientside_callback(
+            ClientsideFunction(namespace='ui', function_name='toggle'),
+            Output(f"collapse-{section}", "is_open"),
+            [Input(f"tab-{section}", "n_clicks")],
+            [State(f"collapse-{section}", "is_open")]
+        )
 
-    # Toggle Execution collapse
-    @app.callback(
-        Output("collapse-execution", "is_open"),
-        [Input("tab-execution", "n_clicks")],
-        [State("collapse-execution", "is_open")]
-    )
-    def toggle_execution(n, is_open):
-        return not is_open if n else is_open
+    layouts = LRUDict(LAYOUT_CACHE_SIZE)
 
-    # Toggle Risk&PnL collapse
-    @app.callback(
-        Output("collapse-riskpnl", "is_open"),
-        [Input("tab-riskpnl", "n_clicks")],
-        [State("collapse-riskpnl", "is_open")]
-    )
-    def toggle_riskpnl(n, is_open):
-        return not is_open if n else is_open
+    def build_layout(sub):
+        # Page modules are imported on first visit to keep startup light
+        if sub == 'subtab-eventpricing':
+            from ..layouts.event_pricing_layout import event_pricing_layout
+            return event_pricing_layout()
+        if sub == 'subtab-hedging':
+            from ..layouts.hedging_layout import hedging_layout
+            return hedging_layout(get_positions())
+        if sub == 'subtab-pnlanalytics':
+            from ..layouts.pnl_analytics_layout import pnl_analytics_layout
+            return pnl_analytics_layout()
+        return html.Div(f"{sub} content coming soon.")
+
+    def page_layout(sub):
+        """Layout of a page, built once per data version (and day: the hedge cutoff defaults to today)."""
+        version = get_positions().attrs.get('version') if sub == 'subtab-hedging' else None
+        key = (sub, version, datetime.date.today())
+        layout = layouts.get(key)
+        record_cache('page_layout', layout is not None)
+        if layout is None:
+            layout = build_layout(sub)
+            layouts.put(key, layout)
+        return layout
 
     # Render page content
     @app.callback(
@@ -49,11 +56,4 @@ def register_navigation_callbacks(app, positions):
         ctx = callback_context
         if not ctx.triggered:
             return html.Div()
-        sub = ctx.triggered[0]['prop_id'].split('.')[0]
-        if sub == 'subtab-eventpricing':
-            return event_pricing_layout()
-        if sub == 'subtab-hedging':
-            return hedging_layout(positions)
-        if sub == 'subtab-pnlanalytics':
-            return pnl_analytics_layout()
-        return html.Div(f"{sub} content coming soon.")
\ No newline at end of file
+        return page_layout(ctx.triggered[0]['prop_id'].split('.')[0])
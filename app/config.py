@@ -1,3 +1,39 @@
+import os
+import tempfile
+
 PRIMARY = "#2C3E50"
 SECONDARY = "#18BC9C"
-BACKGROUND = "#F5F7FA"
\ No newline at end of file
+BACKGROUND = "#F5F7FA"
+
+# Add a Server-Timing header (per-callback wall/CPU time) to callback responses
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "0") == "1"
+
+# Logging: 'size' or 'time' rotation; one file per process (unset: automatic under gunicorn)
+LOG_ROTATION = os.environ.get("LOG_ROTATION", "size")
+LOG_PER_WORKER = {"1": True, "0": False}.get(os.environ.get("LOG_PER_WORKER", ""))
+
+# /metrics across worker processes: each one writes its series to a file here and the scrape sums them
+# (unset: a directory per gunicorn master under gunicorn, in-process series otherwise)
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+# Import scipy/pyarrow and load positions at startup instead of on first use
+# (set with gunicorn --preload so workers inherit them from the master)
+PRELOAD = os.environ.get("APP_PRELOAD", "0") == "1"
+
+# Headless batch pricing endpoint: process pool size (None = CPU count) and max seconds per batch
+BATCH_MAX_WORKERS = int(os.environ["BATCH_MAX_WORKERS"]) if "BATCH_MAX_WORKERS" in os.environ else None
+BATCH_TIMEOUT = float(os.environ.get("BATCH_TIMEOUT", "300"))
+# Batch job state files, shared by the workers of one host
+BATCH_JOB_DIR = os.environ.get("BATCH_JOB_DIR", os.path.join(tempfile.gettempdir(), "event_pricing_jobs"))
+
+# Callback ETags: number of recent request -> ETag pairs remembered per worker
+ETAG_CACHE_SIZE = int(os.environ.get("ETAG_CACHE_SIZE", "1024"))
+
+# Page layouts built by the navigation callback and kept per worker (keyed by page and data version)
+LAYOUT_CACHE_SIZE = int(os.environ.get("LAYOUT_CACHE_SIZE", "16"))
+
+# Load positions as categoricals / downcast numerics, with 'Spot % Move' parsed to a decimal
+COMPACT_FRAMES = os.environ.get("COMPACT_FRAMES", "1") == "1"
+
+# Precomputed event pricing snapshots (built nightly by `python -m app.event_pricing.snapshot`)
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.path.dirname(__file__), "..", "data", "snapshots"))
@@ -1,4 +1,6 @@
 from .black_scholes import BlackScholes
 from .event_pricing import EventPricing
+from .lattice import Lattice
+from .batch import price_batch
 
-__all__ = ['BlackScholes', 'EventPricing']
\ No newline at end of file
+__all__ = ['BlackScholes', 'EventPricing', 'Lattice', 'price_batch']
\ No newline at end of file
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from .event_pricing import EventPricing
+
+MARKET_FIELDS = ('S0', 'ann_vol', 'r', 'q', 'target_delta')
+EVENT_FIELDS = ('normal_days', 'non_tdays', 'event_days', 'event_multiplier', 'prob_up')
+DEFAULT_CHUNK_SIZE = 25
+
+
+def parse_underlying(spec: dict) -> dict:
+    """
+    Validate one batch entry and turn it into EventPricing keyword arguments.
+
+    Expected shape (rates and probabilities as decimals, not percent):
+        {"id": "AAPL", "S0": 190.0, "ann_vol": 0.28, "r": 0.05, "q": 0.0, "target_delta": 0.25,
+         "event": {"normal_days": 7, "non_tdays": 2, "event_days": 1,
+                   "event_multiplier": 2.0, "prob_up": 0.6}}
+    Only id, S0 and ann_vol are required; the rest default to EventPricing's defaults.
+
+    Raises:
+        ValueError: On missing or unknown fields and non-numeric values.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Underlying spec must be an object, got {type(spec).__name__}")
+    for field in ('id', 'S0', 'ann_vol'):
+        if field not in spec:
+            raise ValueError(f"Missing required field: {field}")
+    event = spec.get('event') or {}
+    unknown = (set(spec) - set(MARKET_FIELDS) - {'id', 'event'}) | (set(event) - set(EVENT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields for {spec['id']}: {sorted(unknown)}")
+
+    kwargs = {}
+    try:
+        for field in MARKET_FIELDS:
+            if field in spec:
+                kwargs[field] = float(spec[field])
+        for field in EVENT_FIELDS:
+            if field in event:
+                kwargs[field] = int(event[field]) if field.endswith('days') else float(event[field])
+    except (TypeError, ValueError):
+        raise ValueError(f"Non-numeric value in spec for {spec['id']}") from None
+    if kwargs['S0'] <= 0 or kwargs['ann_vol'] <= 0:
+        raise ValueError(f"S0 and ann_vol must be positive for {spec['id']}")
+    return kwargs
+
+
+def _records(df) -> list:
+    # NaN is not valid JSON
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def event_results(ep: EventPricing, include_curves: bool = False) -> dict:
+    """
+    Summary, IV shift and premium change of an EventPricing instance as
+    JSON-ready records; with `include_curves`, also the smile (skew) and
+    the implied vs lognormal densities (pdf) as plain lists.
+    """
+    results = {
+        'eff_vol': float(ep.eff_vol),
+        'summary': _records(ep.summary()),
+        'iv_shift': _records(ep.iv_shift()),
+        'premium_change': _records(ep.premium_pct_change()),
+    }
+    if include_curves:
+        skew = ep.skew()
+        strikes, pdf_implied, pdf_lognormal = ep.pdf(skew=skew)
+        results['skew'] = {'moneyness': list(map(float, skew[0])),
+                           'iv_pre': list(map(float, skew[1])), 'iv_post': list(map(float, skew[2]))}
+        results['pdf'] = {'strikes': list(map(float, strikes)),
+                          'implied': list(map(float, pdf_implied)), 'lognormal': list(map(float, pdf_lognormal))}
+    return results
+
+
+def price_underlying(spec: dict, include_curves: bool = False) -> dict:
+    """event_results() for one batch entry, tagged with its id."""
+    try:
+        ep = EventPricing(**parse_underlying(spec))
+        return {'id': spec['id'], **event_results(ep, include_curves)}
+    except Exception as e:  # one bad name must not sink the whole batch
+        return {'id': spec.get('id'), 'error': str(e)}
+
+
+def _price_chunk(chunk: list, include_curves: bool = False) -> list:
+    return [price_underlying(spec, include_curves) for spec in chunk]
+
+
+def _price_inline(underlyings: list, timeout: float = None, include_curves: bool = False) -> list:
+    # Nothing to interrupt in-process: the deadline is checked between entries
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for spec in underlyings:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch of {len(underlyings)} underlyings did not finish within {timeout}s")
+        results.append(price_underlying(spec, include_curves))
+    return results
+
+
+def _terminate_workers(executor: ProcessPoolExecutor):
+    # shutdown(cancel_futures=True) only drops chunks that have not started:
+    # running ones would keep burning CPU after the caller has given up.
+    processes = list((executor._processes or {}).values())
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5)
+
+
+def price_batch(underlyings: list, max_workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                timeout: float = None, include_curves: bool = False) -> list:
+    """
+    Price a batch of underlyings over a process pool.
+
+    Entries are sent to the workers in chunks of `chunk_size` to amortize
+    inter-process overhead. Results come back in input order; entries that
+    fail to price carry an 'error' message instead of results.
+
+    Args:
+        underlyings (list): Entries in the format accepted by parse_underlying.
+        max_workers (int, optional): Pool size. Defaults to the CPU count.
+        chunk_size (int): Entries per task.
+        timeout (float, optional): Seconds allowed for the whole batch. Worker
+            processes still running when it expires are terminated; without a
+            pool (one worker) it is checked between entries.
+        include_curves (bool): Also return smiles and densities (see event_results).
+
+    Returns:
+        list: One result dict per entry.
+
+    Raises:
+        ValueError: If any entry is invalid (checked before any work starts).
+        TimeoutError: If the batch does not finish within `timeout`.
+    """
+    for spec in underlyings:
+        parse_underlying(spec)
+    if not underlyings:
+        return []
+
+    chunks = [underlyings[i:i + chunk_size] for i in range(0, len(underlyings), chunk_size)]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+    price_chunk = partial(_price_chunk, include_curves=include_curves)
+    if max_workers == 1:
+        return _price_inline(underlyings, timeout, include_curves)
+
+    # spawn, not fork: the caller may be a multi-threaded web server
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    finished = False
+    try:
+        futures = [executor.submit(price_chunk, chunk) for chunk in chunks]
+        done, pending = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        for future in done:
+            if future.exception() is not None:  # e.g. a worker process died
+                raise future.exception()
+        if pending:
+            raise TimeoutError(f"Batch of {len(underlyings)} underlyings did not finish within {timeout}s")
+        results = [result for future in futures for result in future.result()]
+        finished = True
+        return results
+    finally:
+        if not finished:
+            _terminate_workers(executor)
+        executor.shutdown(wait=finished, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price a batch of underlyings around their events.")
+    parser.add_argument('input', help="JSON file with a list of underlyings (or '-' for stdin).")
+    parser.add_argument('-o', '--output', help="Write results here instead of stdout.")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Underlyings per task.")
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds allowed for the whole batch.")
+    args = parser.parse_args()
+
+    if args.input == '-':
+        underlyings = json.load(sys.stdin)
+    else:
+        with open(args.input) as f:
+            underlyings = json.load(f)
+    results = price_batch(underlyings, max_workers=args.workers, chunk_size=args.chunk_size, timeout=args.timeout)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f)
+    else:
+        json.dump(results, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
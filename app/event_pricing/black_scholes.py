@@ -1,6 +1,21 @@
 import numpy as np
-from scipy.stats import norm
-from scipy.optimize import brentq
+
+
+# scipy is imported on first use: it is the slowest import of the app
+def _norm_cdf(x):
+    from scipy.special import ndtr  # standard normal CDF, same as scipy.stats.norm.cdf
+    return ndtr(x)
+
+
+def _norm_ppf(p):
+    from scipy.special import ndtri
+    return ndtri(p)
+
+
+def _brentq(f, a, b):
+    from scipy.optimize import brentq
+    return brentq(f, a, b)
+
 
 class BlackScholes:
     """
@@ -20,9 +35,9 @@ class BlackScholes:
         d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
         d2 = d1 - sigma * np.sqrt(T)
         if call:
-            return S * np.exp(-q * T) * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+            return S * np.exp(-q * T) * _norm_cdf(d1) - K * np.exp(-r * T) * _norm_cdf(d2)
         else:
-            return K * np.exp(-r * T) * norm.cdf(-d2) - S * np.exp(-q * T) * norm.cdf(-d1)
+            return K * np.exp(-r * T) * _norm_cdf(-d2) - S * np.exp(-q * T) * _norm_cdf(-d1)
     
     def price(self, sigma: float, call: bool = True) -> float:
         """Instance wrapper around calc_price."""
@@ -35,7 +50,7 @@ class BlackScholes:
     def delta(self, sigma: float, call: bool = True) -> float:
         """Delta for given volatility."""
         d1 = self._d1(sigma)
-        return (np.exp(-self.q * self.T) * norm.cdf(d1)) if call else (-np.exp(-self.q * self.T) * norm.cdf(-d1))
+        return (np.exp(-self.q * self.T) * _norm_cdf(d1)) if call else (-np.exp(-self.q * self.T) * _norm_cdf(-d1))
     
     @staticmethod
     def find_strike(S: float, T: float, r: float, q: float,
@@ -45,14 +60,23 @@ class BlackScholes:
         a, b = bracket
         b = b or S * 10
         f = lambda K: BlackScholes(S, K, T, r, q).delta(sigma, call) - target_delta
-        return brentq(f, a, b)
+        return _brentq(f, a, b)
     
+    @staticmethod
+    def delta_strike(S, T, r, q, sigma, target_delta, call: bool = True):
+        """Closed-form find_strike: vectorized over any array-valued argument."""
+        # call: exp(-qT) N(d1) = delta; put: -exp(-qT) N(-d1) = delta
+        d1 = _norm_ppf(np.abs(target_delta) * np.exp(q * T))
+        if not call:
+            d1 = -d1
+        return S * np.exp((r - q + 0.5 * sigma**2) * T - d1 * sigma * np.sqrt(T))
+
     @staticmethod
     def find_ivol(price: float, S: float, K: float, T: float,
                   r: float, q: float, call: bool = True) -> float:
         """Invert BS price to find implied volatility via Brent root-find."""
         f = lambda vol: BlackScholes.calc_price(S, K, T, r, q, vol, call) - price
-        return brentq(f, 1e-6, 5.0)
+        return _brentq(f, 1e-6, 5.0)
     
     @staticmethod
     def find_straddle_ivol(straddle_price: float, S: float, K: float, T: float, r: float, q: float) -> float:
@@ -60,4 +84,4 @@ class BlackScholes:
         f = lambda vol: (BlackScholes.calc_price(S, K, T, r, q, vol, call=True)
                          + BlackScholes.calc_price(S, K, T, r, q, vol, call=False)
                          - straddle_price)
-        return brentq(f, 1e-6, 5.0)
\ No newline at end of file
+        return _brentq(f, 1e-6, 5.0)
\ No newline at end of file
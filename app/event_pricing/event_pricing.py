@@ -1,11 +1,20 @@
 import numpy as np
 import pandas as pd
 from .black_scholes import BlackScholes
+from .lattice import Lattice
 
 class EventPricing:
     """
     Compute option prices before and after a discrete event.
+
+    Scenario prices come from Black-Scholes at the effective vol (model='black_scholes')
+    or from an American lattice over the event variance schedule (model='lattice').
+    Optional discrete cash dividends, as (time in years, amount) pairs, use the
+    escrowed model under both: options are priced on the spot less the PV of
+    the dividends paid before expiry.
     """
+    MODELS = ('black_scholes', 'lattice')
+
     def __init__(self, 
                  S0: float = 100.0, 
                  ann_vol: float = 0.30, 
@@ -16,7 +25,12 @@ class EventPricing:
                  event_days: int = 1,
                  event_multiplier: float = 2.0,
                  prob_up: float = 0.9,
-                 target_delta: float = 0.25):
+                 target_delta: float = 0.25,
+                 model: str = 'black_scholes',
+                 dividends: tuple = (),
+                 lattice_steps: int = 200):
+        if model not in self.MODELS:
+            raise ValueError(f"Unknown pricing model: {model}")
         self.S0 = S0
         self.ann_vol = ann_vol
         self.r = r
@@ -27,7 +41,11 @@ class EventPricing:
         self.event_multiplier = event_multiplier
         self.prob_up = prob_up
         self.target_delta = target_delta
+        self.model = model
+        self.dividends = tuple(dividends)
+        self.lattice_steps = lattice_steps
         self.T = (normal_days + non_tdays + event_days) / 252.0
+        self._scenarios = {}  # spot -> price_scenario result, shared by summary/iv_shift/premium_pct_change
         self._compute_effective_vol()
 
     def _compute_effective_vol(self):
@@ -38,8 +56,23 @@ class EventPricing:
                       self.event_days * event_var)
         self.eff_vol = np.sqrt(period_var / self.T)
 
+    def variance_schedule(self) -> list:
+        """
+        Chronological (years, total variance) segments of the period: normal
+        trading days, then non-trading days, then the event days.
+        """
+        daily_var = self.ann_vol**2 / 252.0
+        segments = [(self.normal_days, daily_var), (self.non_tdays, 0.0),
+                    (self.event_days, daily_var * self.event_multiplier)]
+        return [(days / 252.0, days * var) for days, var in segments if days > 0]
+
+    def pv_dividends(self):
+        """Present value of the cash dividends paid before expiry."""
+        T = np.asarray(self.T)
+        return sum((np.where((t > 0) & (t <= T), D * np.exp(-self.r * t), 0.0) for t, D in self.dividends), 0.0)
+
     def forward_price(self) -> float:
-        return self.S0 * np.exp((self.r - self.q) * self.T)
+        return (self.S0 - self.pv_dividends()) * np.exp((self.r - self.q) * self.T)
     
     def jump_factors(self) -> tuple:
         T_event = self.event_days / 252.0
@@ -51,15 +84,28 @@ class EventPricing:
         return self.S0 * (self.prob_up * up + (1 - self.prob_up) * down)
 
     def price_scenario(self, S: float) -> dict:
-        bs = BlackScholes(S, S, self.T, self.r, self.q)
-        fwd = self.forward_price() if S == self.S0 else S * np.exp((self.r - self.q) * self.T)
-        atm_call = bs.price(self.eff_vol, call=True)
-        atm_put = bs.price(self.eff_vol, call=False)
-        straddle = atm_call + atm_put
+        if S not in self._scenarios:
+            self._scenarios[S] = self._price_scenario(S)
+        return dict(self._scenarios[S])
+
+    def _price_scenario(self, S: float) -> dict:
+        fwd = self.forward_price() if S == self.S0 else (S - self.pv_dividends()) * np.exp((self.r - self.q) * self.T)
+        # Wing strikes are picked by Black-Scholes delta under both models
         Kp = BlackScholes.find_strike(S, self.T, self.r, self.q, self.eff_vol, -self.target_delta, call=False)
         Kc = BlackScholes.find_strike(S, self.T, self.r, self.q, self.eff_vol, self.target_delta, call=True)
-        p = BlackScholes(S, Kp, self.T, self.r, self.q).price(self.eff_vol, call=False)
-        c = BlackScholes(S, Kc, self.T, self.r, self.q).price(self.eff_vol, call=True)
+        if self.model == 'lattice':
+            lattice = Lattice(S, self.T, self.r, self.q, variance_schedule=self.variance_schedule(),
+                              dividends=self.dividends)
+            # One pass over the tree for all four options
+            atm_call, atm_put, p, c = lattice.price([S, S, Kp, Kc], [True, False, False, True], steps=self.lattice_steps)
+        else:
+            S_ex = S - self.pv_dividends()  # escrowed spot, as in the lattice
+            bs = BlackScholes(S_ex, S, self.T, self.r, self.q)
+            atm_call = bs.price(self.eff_vol, call=True)
+            atm_put = bs.price(self.eff_vol, call=False)
+            p = BlackScholes(S_ex, Kp, self.T, self.r, self.q).price(self.eff_vol, call=False)
+            c = BlackScholes(S_ex, Kc, self.T, self.r, self.q).price(self.eff_vol, call=True)
+        straddle = atm_call + atm_put
         return {'forward': fwd, 'straddle': straddle,
                 'put_strike': Kp, 'put_price': p,
                 'call_strike': Kc, 'call_price': c}
@@ -74,11 +120,12 @@ class EventPricing:
         label = f"{delta_pct}Δ"
         pre = self.price_scenario(self.S0)
         post = self.price_scenario(self.drifted_forward())
+        S_ex = self.S0 - self.pv_dividends()  # prices are on the escrowed spot: invert against it too
         rows = []
         for name, S, K_pre, K_post, price_pre, price_post, is_call in [
-            ("ATM Straddle", self.S0, self.S0, self.S0, pre['straddle'], post['straddle'], True),
-            (f"{label} Put", self.S0, pre['put_strike'], post['put_strike'], pre['put_price'], post['put_price'], False),
-            (f"{label} Call", self.S0, pre['call_strike'], post['call_strike'], pre['call_price'], post['call_price'], True)
+            ("ATM Straddle", S_ex, self.S0, self.S0, pre['straddle'], post['straddle'], True),
+            (f"{label} Put", S_ex, pre['put_strike'], post['put_strike'], pre['put_price'], post['put_price'], False),
+            (f"{label} Call", S_ex, pre['call_strike'], post['call_strike'], pre['call_price'], post['call_price'], True)
         ]:
             if name == "ATM Straddle":
                 iv_pre = BlackScholes.find_straddle_ivol(price_pre, S, K_pre, self.T, self.r, self.q) * 100
@@ -101,35 +148,38 @@ class EventPricing:
             out.append({'Option': name, 'Pre': pre[col], 'Post': post[col], 'PctChange': pct})
         return pd.DataFrame(out)
     
-    def skew(self):
-        moneyness = np.linspace(0.75, 1.25, 50) # strikes from 75% to 125% of spot
+    def skew(self, n_strikes: int = 50):
+        moneyness = np.linspace(0.75, 1.25, n_strikes) # strikes from 75% to 125% of spot
         strikes = moneyness * self.S0
         u, d = self.jump_factors()
+        pv = self.pv_dividends()
+        S_ex = self.S0 - pv  # escrowed spot, as in price_scenario()
         ivs_pre, ivs_post = [], []
 
         for K in strikes:
             # pre: flat BS
-            price_pre = BlackScholes.calc_price(self.S0, K, self.T, self.r, self.q, self.eff_vol, call=True)
+            price_pre = BlackScholes.calc_price(S_ex, K, self.T, self.r, self.q, self.eff_vol, call=True)
             try:
-                iv_pre = BlackScholes.find_ivol(price_pre, self.S0, K, self.T, self.r, self.q, call=True) * 100
+                iv_pre = BlackScholes.find_ivol(price_pre, S_ex, K, self.T, self.r, self.q, call=True) * 100
             except Exception:
                 iv_pre = np.nan
             ivs_pre.append(iv_pre)
 
             # post: 
-            S = self.drifted_forward() # drifted forward
+            S = self.drifted_forward() - pv # drifted forward, escrowed
             # is_call = (K >= S)
             is_call = True
             price_post = BlackScholes(S, K, self.T, self.r, self.q).price(self.eff_vol, call=is_call)
             try:
-                iv_post = BlackScholes.find_ivol(price_post, self.S0, K, self.T, self.r, self.q, call=is_call) * 100
+                iv_post = BlackScholes.find_ivol(price_post, S_ex, K, self.T, self.r, self.q, call=is_call) * 100
             except Exception:
                 iv_post = np.nan
             ivs_post.append(iv_post)
         return (moneyness, ivs_pre, ivs_post)
     
-    def pdf(self):
-        moneyness, ivs_pre, ivs_post = self.skew()
+    def pdf(self, n_strikes: int = 50, skew: tuple = None):
+        # Pass the result of skew() to avoid computing the smile twice
+        moneyness, ivs_pre, ivs_post = skew if skew is not None else self.skew(n_strikes)
         strikes = np.array(moneyness) * self.S0
         F = self.forward_price()
         pdf_implied, pdf_lognormal = [], []
@@ -0,0 +1,116 @@
+import os
+import re
+import json
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .batch import DEFAULT_CHUNK_SIZE, parse_underlying, price_batch
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+
+class BatchJobs:
+    """
+    Batch pricing jobs run in the background of the web process, so that no
+    request waits for a batch: submit() returns a job id right away and the
+    client polls status() for the results.
+
+    Each job's state is a JSON file in `job_dir`, so any worker of a
+    multi-process server can answer the poll. Jobs run one at a time per
+    process (each one already spreads over a process pool).
+    """
+    def __init__(self, job_dir: str, max_workers: int = None, timeout: float = 300.0, ttl: float = 24 * 3600):
+        """
+        Args:
+            job_dir (str): Directory for the job state files.
+            max_workers (int, optional): Process pool size per job (see price_batch).
+            timeout (float): Maximum seconds a job may run.
+            ttl (float): Seconds after which finished job files are deleted.
+        """
+        self.job_dir = job_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-job')
+        os.makedirs(job_dir, exist_ok=True)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _write(self, job_id: str, state: dict):
+        # Write then rename: readers never see a partial file
+        tmp = f"{self._path(job_id)}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'job_id': job_id, **state}, f)
+        os.replace(tmp, self._path(job_id))
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.job_dir):
+            path = os.path.join(self.job_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:  # removed by another worker
+                pass
+
+    def submit(self, underlyings: list, chunk_size: int = DEFAULT_CHUNK_SIZE, timeout: float = None) -> str:
+        """
+        Validate and queue a batch.
+
+        Returns:
+            str: Job id for status().
+
+        Raises:
+            ValueError: If any entry is invalid (nothing is queued).
+        """
+        for spec in underlyings:
+            parse_underlying(spec)
+        self._prune()
+        job_id = uuid.uuid4().hex
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        self._write(job_id, {'status': 'queued', 'pid': os.getpid(), 'count': len(underlyings)})
+        self._executor.submit(self._run, job_id, underlyings, chunk_size, timeout)
+        return job_id
+
+    def _run(self, job_id: str, underlyings: list, chunk_size: int, timeout: float):
+        self._write(job_id, {'status': 'running', 'pid': os.getpid(), 'count': len(underlyings)})
+        try:
+            results = price_batch(underlyings, max_workers=self.max_workers, chunk_size=chunk_size, timeout=timeout)
+        except TimeoutError as e:
+            logger.warning("Batch job %s timed out", job_id)
+            self._write(job_id, {'status': 'failed', 'error': str(e)})
+        except Exception as e:
+            logger.exception("Batch job %s failed", job_id)
+            self._write(job_id, {'status': 'failed', 'error': str(e)})
+        else:
+            self._write(job_id, {'status': 'done', 'results': results})
+
+    def status(self, job_id: str):
+        """
+        State of a job: {'job_id', 'status': 'queued' | 'running' | 'done' | 'failed',
+        plus 'results' when done or 'error' when failed}, or None if unknown.
+        """
+        if not JOB_ID.fullmatch(job_id or ''):
+            return None
+        try:
+            with open(self._path(job_id)) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state['status'] in ('queued', 'running') and not _process_alive(state['pid']):
+            return {'job_id': job_id, 'status': 'failed', 'error': "The worker running the job exited"}
+        return state
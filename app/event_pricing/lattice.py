@@ -0,0 +1,194 @@
+import numpy as np
+from .black_scholes import BlackScholes
+
+
+class Lattice:
+    """
+    Recombining binomial/trinomial tree for American and European options
+    with a time-varying variance schedule (e.g. an event-day variance jump)
+    and discrete cash dividends.
+
+    Steps are spaced in variance rather than calendar time, so the tree
+    recombines even though variance is concentrated on event days: every
+    step carries the same variance and its calendar length varies instead.
+    Dividends use the escrowed model: the tree is built on the spot net of
+    the PV of dividends paid before expiry, which is added back at each node
+    to get the price the early-exercise test is made against.
+    """
+    METHODS = ('binomial', 'trinomial')
+
+    def __init__(self, S: float, T: float, r: float = 0.0, q: float = 0.0,
+                 sigma: float = None, variance_schedule: list = None,
+                 dividends: tuple = (), method: str = 'binomial'):
+        """
+        Args:
+            S (float): Spot price.
+            T (float): Time to expiry in years.
+            r (float): Continuously compounded rate.
+            q (float): Continuous dividend yield.
+            sigma (float, optional): Flat volatility, if no variance schedule is given.
+            variance_schedule (list, optional): Chronological (years, total variance)
+                segments covering T, e.g. EventPricing.variance_schedule().
+            dividends (tuple): (time in years, cash amount) pairs; those after T are ignored.
+            method (str): 'binomial' or 'trinomial'.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown lattice method: {method}")
+        if variance_schedule is None:
+            if sigma is None:
+                raise ValueError("Either sigma or variance_schedule is required")
+            variance_schedule = [(T, sigma**2 * T)]
+        durations, variances = (np.array(x, dtype=float) for x in zip(*variance_schedule))
+        if not np.isclose(durations.sum(), T) or variances.sum() <= 0:
+            raise ValueError("Variance schedule must cover T with positive total variance")
+
+        self.S = S
+        self.T = T
+        self.r = r
+        self.q = q
+        self.method = method
+        self.dividends = tuple((t, D) for t, D in dividends if 0 < t <= T)
+        self.total_var = variances.sum()
+        self._cum_time = np.concatenate([[0.0], np.cumsum(durations)])
+        self._cum_var = np.concatenate([[0.0], np.cumsum(variances)])
+        self._variances = variances
+        self._durations = durations
+
+    def step_times(self, steps: int) -> np.ndarray:
+        """Calendar times of the `steps` + 1 equal-variance step boundaries."""
+        v = np.linspace(0.0, self.total_var, steps + 1)
+        # Segment holding each boundary; zero-variance segments (non-trading
+        # days) are folded into the step that spans them.
+        k = np.clip(np.searchsorted(self._cum_var, v, side='right') - 1, 0, len(self._variances) - 1)
+        seg_var = np.where(self._variances[k] > 0, self._variances[k], 1.0)
+        t = self._cum_time[k] + (v - self._cum_var[k]) / seg_var * self._durations[k]
+        t[0], t[-1] = 0.0, self.T
+        return t
+
+    def pv_dividends(self, t):
+        """Value at time(s) t of the dividends paid in (t, T]."""
+        t = np.asarray(t, dtype=float)
+        return sum((np.where(tau > t, D * np.exp(-self.r * (tau - t)), 0.0) for tau, D in self.dividends),
+                   np.zeros_like(t))
+
+    def price(self, K, call=True, american: bool = True, steps: int = 200,
+              richardson: bool = True) -> np.ndarray:
+        """
+        Price a vector of options in one pass over the tree.
+
+        Args:
+            K: Strike(s).
+            call: True for calls, False for puts (scalar or array broadcast with K).
+            american (bool): Allow early exercise.
+            steps (int): Number of tree steps.
+            richardson (bool): Extrapolate 2 * P(steps) - P(steps / 2).
+                The last step is always priced with Black-Scholes, which removes
+                the odd/even oscillation that would otherwise defeat extrapolation.
+
+        Returns:
+            np.ndarray: Prices, one per (K, call) pair.
+        """
+        K, call = np.broadcast_arrays(np.atleast_1d(np.asarray(K, dtype=float)), np.atleast_1d(call))
+        return price_lattices([self], K[None, :], call[None, :], american, steps, richardson)[0]
+
+
+def price_lattices(lattices: list, K, call, american: bool = True, steps: int = 200,
+                   richardson: bool = True) -> np.ndarray:
+    """
+    Price options on several trees in one backward induction, e.g. every
+    bumped scenario of a sensitivity run: the trees share their step and
+    node counts, so they stack along a leading axis.
+
+    Args:
+        lattices (list): Lattice instances, all of the same method.
+        K: Strikes, shape (len(lattices), options per tree).
+        call: True for calls, False for puts, broadcast with K.
+        american, steps, richardson: As in Lattice.price.
+
+    Returns:
+        np.ndarray: Prices, shaped like K.
+    """
+    if len({lattice.method for lattice in lattices}) != 1:
+        raise ValueError("All lattices must use the same method")
+    K, call = np.broadcast_arrays(np.atleast_2d(np.asarray(K, dtype=float)), np.atleast_2d(call))
+    if len(K) != len(lattices):
+        raise ValueError("K needs one row of strikes per lattice")
+    phi = np.where(call, 1.0, -1.0)
+    price = _price_trees(lattices, K, phi, american, steps)
+    if richardson:
+        price = 2 * price - _price_trees(lattices, K, phi, american, max(steps // 2, 2))
+    return price
+
+
+def _price_trees(lattices: list, K: np.ndarray, phi: np.ndarray, american: bool, steps: int) -> np.ndarray:
+    # Arrays are (trees, options, nodes); per-tree parameters are (trees, 1) columns
+    column = lambda values: np.array(values, dtype=float)[:, None]
+    r = column([lattice.r for lattice in lattices])
+    q = column([lattice.q for lattice in lattices])
+    t = np.stack([lattice.step_times(steps) for lattice in lattices])
+    dt = np.diff(t, axis=1)
+    dv = column([lattice.total_var for lattice in lattices]) / steps
+    disc = np.exp(-r * dt)
+    s_star = column([lattice.S - lattice.pv_dividends(0.0) for lattice in lattices])
+
+    if lattices[0].method == 'binomial':
+        dx = np.sqrt(dv)
+        u, d = np.exp(dx), np.exp(-dx)
+        p_up = (np.exp((r - q) * dt) - d) / (u - d)
+        probs = np.stack([1 - p_up, p_up])  # weights of nodes i, i + 1
+        width, n_nodes = 1, lambda j: j + 1
+        grid = np.exp(2 * dx * np.arange(steps + 1))  # node i at step j: s_star * exp((2i - j) dx)
+    else:
+        dx = np.sqrt(3 * dv)
+        m = (r - q) * dt - 0.5 * dv
+        p_up = 0.5 * ((dv + m**2) / dx**2 + m / dx)
+        p_down = 0.5 * ((dv + m**2) / dx**2 - m / dx)
+        probs = np.stack([p_down, 1 - p_up - p_down, p_up])  # weights of nodes i, i + 1, i + 2
+        width, n_nodes = 2, lambda j: 2 * j + 1
+        grid = np.exp(dx * np.arange(2 * steps + 1))  # node i at step j: s_star * exp((i - j) dx)
+    if np.any(probs < 0) or np.any(probs > 1):
+        raise ValueError(f"Negative lattice probabilities: use more than {steps} steps")
+    # Escrowed dividends added back to the node spots for the exercise test
+    pv_divs = np.stack([lattice.pv_dividends(times) for lattice, times in zip(lattices, t)]) if american else None
+
+    # Two rows per option, reused at every step: O(steps) memory per option
+    n = n_nodes(steps - 1)
+    values = np.empty(K.shape + (n,))
+    scratch = np.empty(K.shape + (n,))
+    spot = np.empty((len(lattices), n))
+
+    def node_spots(j):
+        np.multiply(grid[:, :n_nodes(j)], s_star * np.exp(-j * dx), out=spot[:, :n_nodes(j)])
+        return spot[:, :n_nodes(j)]
+
+    # Last step: European Black-Scholes over the final interval
+    j = steps - 1
+    s_nodes = node_spots(j)[:, None, :]
+    dt_last = dt[:, j, None, None]
+    sigma_last = np.sqrt(dv[:, :, None] / dt_last)
+    calls = BlackScholes.calc_price(s_nodes, K[:, :, None], dt_last, r[:, :, None], q[:, :, None], sigma_last, call=True)
+    # Put-call parity for the puts
+    parity = s_nodes * np.exp(-q[:, :, None] * dt_last) - K[:, :, None] * disc[:, j, None, None]
+    values[:, :, :n] = np.where(phi[:, :, None] > 0, calls, calls - parity)
+    if american:
+        _exercise(values, scratch, node_spots(j) + pv_divs[:, j, None], K, phi)
+
+    for j in range(steps - 2, -1, -1):
+        k = n_nodes(j)
+        w = (probs[:, :, j] * disc[:, j])[:, :, None, None]
+        # values[..., i] <- sum_l w[l] * values[..., i + l], in place
+        np.multiply(values[:, :, 1:k + 1], w[1], out=scratch[:, :, :k])
+        if width == 2:
+            scratch[:, :, :k] += w[2] * values[:, :, 2:k + 2]
+        values[:, :, :k] *= w[0]
+        values[:, :, :k] += scratch[:, :, :k]
+        if american:
+            _exercise(values[:, :, :k], scratch[:, :, :k], node_spots(j) + pv_divs[:, j, None], K, phi)
+    return values[:, :, 0].copy()
+
+
+def _exercise(values, scratch, spots, K, phi):
+    k = spots.shape[1]
+    np.subtract(spots[:, None, :], K[:, :, None], out=scratch[:, :, :k])
+    scratch[:, :, :k] *= phi[:, :, None]
+    np.maximum(values[:, :, :k], scratch[:, :, :k], out=values[:, :, :k])
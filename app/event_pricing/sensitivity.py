@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from .black_scholes import BlackScholes
+from .event_pricing import EventPricing
+from .lattice import Lattice, price_lattices
+
+# Absolute bump sizes (days for the day counts)
+DEFAULT_BUMPS = {
+    'ann_vol': 0.01,
+    'event_multiplier': 0.5,
+    'prob_up': 0.05,
+    'normal_days': 1,
+    'non_tdays': 1,
+    'event_days': 1,
+}
+# Bumped values are clipped to these bounds
+LIMITS = {
+    'ann_vol': (1e-4, np.inf),
+    'event_multiplier': (0.0, np.inf),
+    'prob_up': (0.0, 1.0),
+    'normal_days': (0, np.inf),
+    'non_tdays': (0, np.inf),
+    'event_days': (0, np.inf),
+}
+OUTPUTS = ('straddle', 'put_price', 'call_price')
+DAY_FIELDS = ('normal_days', 'non_tdays', 'event_days')
+
+
+def _scenario_prices(S, T, r, q, vol, target_delta, pv_dividends=0.0) -> dict:
+    """
+    EventPricing.price_scenario under Black-Scholes for array-valued inputs:
+    closed-form delta strikes instead of root-finding, so every scenario is
+    priced in the same NumPy call.
+    """
+    Kp = BlackScholes.delta_strike(S, T, r, q, vol, -target_delta, call=False)
+    Kc = BlackScholes.delta_strike(S, T, r, q, vol, target_delta, call=True)
+    S_ex = S - pv_dividends
+    straddle = (BlackScholes.calc_price(S_ex, S, T, r, q, vol, call=True)
+                + BlackScholes.calc_price(S_ex, S, T, r, q, vol, call=False))
+    return {'straddle': straddle,
+            'put_price': BlackScholes.calc_price(S_ex, Kp, T, r, q, vol, call=False),
+            'call_price': BlackScholes.calc_price(S_ex, Kc, T, r, q, vol, call=True)}
+
+
+def _bumped_params(ep: EventPricing, bumps: dict) -> dict:
+    # Row 2i is parameter i bumped down, row 2i + 1 bumped up; the rest stay at base
+    params = {field: np.full(2 * len(bumps), float(getattr(ep, field))) for field in DEFAULT_BUMPS}
+    for i, (field, size) in enumerate(bumps.items()):
+        low, high = LIMITS[field]
+        base = getattr(ep, field)
+        params[field][2 * i] = max(base - size, low)
+        params[field][2 * i + 1] = min(base + size, high)
+    return params
+
+
+def _lattice_scenarios(ep: EventPricing, params: dict) -> dict:
+    # Pre and Post trees of every bump, priced in one batched backward induction
+    trees, strikes = [], []
+    for i in range(len(params['ann_vol'])):
+        bumped = EventPricing(S0=ep.S0, r=ep.r, q=ep.q, target_delta=ep.target_delta,
+                              **{field: values[i] for field, values in params.items()})
+        for S in (ep.S0, bumped.drifted_forward()):
+            trees.append(Lattice(S, bumped.T, ep.r, ep.q, variance_schedule=bumped.variance_schedule(),
+                                 dividends=ep.dividends))
+            strikes.append([S, S,
+                            BlackScholes.delta_strike(S, bumped.T, ep.r, ep.q, bumped.eff_vol, -ep.target_delta, call=False),
+                            BlackScholes.delta_strike(S, bumped.T, ep.r, ep.q, bumped.eff_vol, ep.target_delta, call=True)])
+    prices = price_lattices(trees, strikes, [True, False, False, True], steps=ep.lattice_steps)
+    prices = prices.reshape(-1, 2, 4)  # bump, Pre/Post, option
+    return {name: {'straddle': prices[:, j, 0] + prices[:, j, 1], 'put_price': prices[:, j, 2],
+                   'call_price': prices[:, j, 3]}
+            for j, name in enumerate(('Pre', 'Post'))}
+
+
+def sensitivities(ep: EventPricing, bumps: dict = None, base: list = None) -> pd.DataFrame:
+    """
+    Bump-and-reprice sensitivities of the Pre/Post straddle and delta wings.
+
+    All up/down bumps are priced in a single vectorized pass: stacked into
+    one EventPricing with array-valued parameters under Black-Scholes, or
+    into one batched backward induction over all the bumped trees under the
+    lattice model.
+
+    Args:
+        ep (EventPricing): Base valuation.
+        bumps (dict, optional): Parameter -> absolute bump size. Defaults to DEFAULT_BUMPS.
+            Day counts are bumped by whole days.
+        base (list, optional): Summary records of `ep` already priced (the
+            'summary' of event_results(), e.g. from the snapshot), so that the
+            base is not priced again.
+
+    Returns:
+        pd.DataFrame: One row per parameter x instrument with the base, down
+            and up values and the changes from base.
+    """
+    bumps = dict(DEFAULT_BUMPS if bumps is None else bumps)
+    unknown = set(bumps) - set(DEFAULT_BUMPS)
+    if unknown:
+        raise ValueError(f"Cannot bump: {sorted(unknown)}")
+    fractional = [field for field in DAY_FIELDS if field in bumps and bumps[field] != int(bumps[field])]
+    if fractional:
+        raise ValueError(f"Day counts are bumped by whole days: {fractional}")
+
+    params = _bumped_params(ep, bumps)
+    if base is None:
+        base = {'Pre': ep.price_scenario(ep.S0), 'Post': ep.price_scenario(ep.drifted_forward())}
+    else:
+        base = {row['Scenario']: row for row in base}
+    if ep.model == 'black_scholes':
+        # EventPricing's formulas are plain NumPy: array parameters give every bump at once
+        bumped = EventPricing(S0=ep.S0, r=ep.r, q=ep.q, target_delta=ep.target_delta, dividends=ep.dividends, **params)
+        n = len(bumped.T)
+        # Stack the Pre (spot) and Post (drifted forward) scenarios as well
+        spots = np.concatenate([np.full(n, float(ep.S0)), bumped.drifted_forward()])
+        prices = _scenario_prices(spots, np.tile(bumped.T, 2), ep.r, ep.q, np.tile(bumped.eff_vol, 2), ep.target_delta,
+                                  np.tile(np.broadcast_to(bumped.pv_dividends(), n), 2))
+        scenarios = {'Pre': {k: v[:n] for k, v in prices.items()}, 'Post': {k: v[n:] for k, v in prices.items()}}
+    else:
+        scenarios = _lattice_scenarios(ep, params)
+
+    label = f"{int(ep.target_delta * 100)}Δ"
+    names = {'straddle': 'Straddle', 'put_price': f'{label} Put', 'call_price': f'{label} Call'}
+    out = []
+    for i, (field, size) in enumerate(bumps.items()):
+        for scenario in ('Pre', 'Post'):
+            for output in OUTPUTS:
+                b = base[scenario][output]
+                down, up = scenarios[scenario][output][2 * i:2 * i + 2]
+                out.append({'Parameter': field, 'Bump': size, 'Instrument': f"{scenario} {names[output]}",
+                            'Base': b, 'Down': down, 'Up': up, 'Δ Down': down - b, 'Δ Up': up - b})
+    return pd.DataFrame(out)
@@ -0,0 +1,175 @@
+import os
+import re
+import sys
+import json
+import inspect
+import logging
+import argparse
+import datetime
+from functools import lru_cache
+from .event_pricing import EventPricing
+from .batch import MARKET_FIELDS, EVENT_FIELDS, price_batch, event_results
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+SNAPSHOT_PATTERN = re.compile(rf"event_pricing_v{SCHEMA_VERSION}_(\d{{8}})\.arrow$")
+KEY_FIELDS = MARKET_FIELDS + EVENT_FIELDS
+TABLE_FIELDS = ('summary', 'iv_shift', 'premium_change')
+CURVE_FIELDS = {'skew': ('moneyness', 'iv_pre', 'iv_post'), 'pdf': ('strikes', 'implied', 'lognormal')}
+_DEFAULTS = {name: p.default for name, p in inspect.signature(EventPricing).parameters.items()}
+
+
+def snapshot_key(params: dict) -> tuple:
+    """Exact-match key of a set of EventPricing arguments (missing ones take the defaults)."""
+    return tuple(round(float(params.get(field, _DEFAULTS[field])), 10) for field in KEY_FIELDS)
+
+
+def expand_universe(universe: dict) -> list:
+    """
+    Cross the universe's underlyings with its parameter presets.
+
+    Format (see data/event_snapshot_universe.json):
+        {"underlyings": [{"id": "AAPL", "S0": 190.0, "ann_vol": 0.28, ...}, ...],
+         "presets": [{"name": "earnings", "target_delta": 0.25, "event": {...}}, ...]}
+    Underlyings use the batch entry format (see batch.parse_underlying).
+    """
+    specs = []
+    for underlying in universe['underlyings']:
+        for preset in universe.get('presets') or [{'name': 'default'}]:
+            spec = {**underlying, 'event': {**(underlying.get('event') or {}), **(preset.get('event') or {})}}
+            if 'target_delta' in preset:
+                spec['target_delta'] = preset['target_delta']
+            specs.append((preset['name'], spec))
+    return specs
+
+
+def build_snapshot(universe: dict, out_dir: str, date: datetime.date = None, **batch_kwargs) -> str:
+    """
+    Price every underlying x preset of `universe` (summaries, smiles and
+    densities) and write them to <out_dir>/event_pricing_v<schema>_<YYYYMMDD>.arrow.
+
+    Returns:
+        str: Path of the snapshot written.
+    """
+    import pyarrow as pa
+    from .batch import parse_underlying
+
+    specs = expand_universe(universe)
+    results = price_batch([spec for _, spec in specs], include_curves=True, **batch_kwargs)
+
+    columns = {name: [] for name in ('id', 'preset') + KEY_FIELDS + ('eff_vol',) + TABLE_FIELDS}
+    for curve, fields in CURVE_FIELDS.items():
+        for field in fields:
+            columns[f'{curve}_{field}'] = []
+    for (preset, spec), result in zip(specs, results):
+        if 'error' in result:
+            logger.warning("Snapshot: skipping %s/%s: %s", spec['id'], preset, result['error'])
+            continue
+        params = parse_underlying(spec)
+        columns['id'].append(str(spec['id']))
+        columns['preset'].append(preset)
+        for field, value in zip(KEY_FIELDS, snapshot_key(params)):
+            columns[field].append(value)
+        columns['eff_vol'].append(result['eff_vol'])
+        for field in TABLE_FIELDS:
+            columns[field].append(json.dumps(result[field]))
+        for curve, fields in CURVE_FIELDS.items():
+            for field in fields:
+                columns[f'{curve}_{field}'].append(result[curve][field])
+
+    date = date or datetime.date.today()
+    metadata = {'schema_version': str(SCHEMA_VERSION), 'built_at': datetime.datetime.now().isoformat()}
+    table = pa.table(columns).replace_schema_metadata(metadata)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"event_pricing_v{SCHEMA_VERSION}_{date:%Y%m%d}.arrow")
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)  # never leave a half-written snapshot for the app to map
+    logger.info("Wrote event pricing snapshot with %d rows to %s", table.num_rows, path)
+    return path
+
+
+def latest_snapshot_path(snapshot_dir: str) -> str:
+    """Most recent snapshot of the current schema version in `snapshot_dir`, or None."""
+    if not os.path.isdir(snapshot_dir):
+        return None
+    matches = sorted((m.group(1), name) for name in os.listdir(snapshot_dir)
+                     if (m := SNAPSHOT_PATTERN.match(name)))
+    return os.path.join(snapshot_dir, matches[-1][1]) if matches else None
+
+
+class EventPricingSnapshot:
+    """
+    Memory-mapped snapshot of precomputed event pricing results.
+    Rows are only materialized on lookup; the index holds just the keys.
+    """
+    def __init__(self, path: str):
+        import pyarrow as pa
+
+        self.path = path
+        self.table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        keys = zip(*(self.table.column(field).to_pylist() for field in KEY_FIELDS))
+        self._index = {tuple(key): i for i, key in enumerate(keys)}
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def lookup(self, params: dict) -> dict:
+        """Results in event_results(..., include_curves=True) format, or None if not in the snapshot."""
+        i = self._index.get(snapshot_key(params))
+        if i is None:
+            return None
+        row = self.table.slice(i, 1).to_pylist()[0]
+        results = {'eff_vol': row['eff_vol']}
+        for field in TABLE_FIELDS:
+            results[field] = json.loads(row[field])
+        for curve, fields in CURVE_FIELDS.items():
+            results[curve] = {field: row[f'{curve}_{field}'] for field in fields}
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_snapshot(snapshot_dir: str) -> EventPricingSnapshot:
+    """The latest snapshot in `snapshot_dir`, mapped once per process (None if there is none)."""
+    path = latest_snapshot_path(snapshot_dir)
+    if path is None:
+        logger.info("No event pricing snapshot in %s: pricing live.", snapshot_dir)
+        return None
+    snapshot = EventPricingSnapshot(path)
+    logger.info("Mapped event pricing snapshot %s (%d rows)", path, len(snapshot))
+    return snapshot
+
+
+def event_pricing_results(params: dict, snapshot: EventPricingSnapshot = None) -> tuple:
+    """
+    Results for EventPricing(**params): served from the snapshot on an exact
+    match, priced live otherwise.
+
+    Returns:
+        tuple: (results in event_results format, True if served from the snapshot)
+    """
+    results = snapshot.lookup(params) if snapshot is not None else None
+    if results is not None:
+        return results, True
+    return event_results(EventPricing(**params), include_curves=True), False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the nightly event pricing snapshot.")
+    parser.add_argument('universe', help="JSON file with underlyings and presets.")
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'snapshots'),
+                        help="Snapshot directory.")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    with open(args.universe) as f:
+        universe = json.load(f)
+    print(build_snapshot(universe, args.out, max_workers=args.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+from .scheduler import ExecutionSchedule, iter_schedule_csv, schedule_orders, STYLES
+
+__all__ = ['ExecutionSchedule', 'iter_schedule_csv', 'schedule_orders', 'STYLES']
@@ -0,0 +1,255 @@
+import csv
+import io
+import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+
+STYLES = ('Limit on Close', 'Inline', 'VWAP')
+
+# Continuous trading sessions in each market's local time
+MARKET_SESSIONS = {
+    'US': (('09:30', '16:00'),),
+    'EU': (('08:00', '16:30'),),
+    'HK': (('09:30', '12:00'), ('13:00', '16:00')),
+    'JP': (('09:00', '11:30'), ('12:30', '15:30')),
+    'AU': (('10:00', '16:00'),),
+    'IN': (('09:15', '15:30'),),
+}
+
+# Timezone of each market's sessions
+MARKET_TIMEZONES = {
+    'US': 'America/New_York',
+    'EU': 'Europe/London',
+    'HK': 'Asia/Hong_Kong',
+    'JP': 'Asia/Tokyo',
+    'AU': 'Australia/Sydney',
+    'IN': 'Asia/Kolkata',
+}
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def _market_time(moment: datetime.datetime, market: str) -> datetime.datetime:
+    """Naive local time of `moment` in `market`; naive moments are taken as market-local already."""
+    if moment.tzinfo is None:
+        return moment
+    if market not in MARKET_TIMEZONES:
+        raise ValueError(f"No timezone for market: {market}")
+    return moment.astimezone(ZoneInfo(MARKET_TIMEZONES[market])).replace(tzinfo=None)
+
+
+def volume_curve(sessions: tuple, bucket_minutes: int = 5) -> np.ndarray:
+    """
+    Expected share of daily volume in each bucket of the day (midnight to
+    midnight): a U-shape over the trading buckets, heavier at the open and
+    the close, and zero outside the sessions.
+    """
+    starts = np.arange(0, 24 * 60, bucket_minutes)
+    trading = np.zeros(len(starts), dtype=bool)
+    for open_, close in sessions:
+        trading |= (starts >= _minutes(open_)) & (starts + bucket_minutes <= _minutes(close))
+    curve = np.zeros(len(starts))
+    x = np.linspace(0.0, 1.0, trading.sum())
+    curve[trading] = 1 + 4 * (x - 0.5)**2
+    return curve / curve.sum()
+
+
+class ExecutionSchedule:
+    """
+    Child orders of a set of hedge orders: a symbols x buckets matrix of
+    signed share quantities (positive buys, negative sells), plus the shares
+    of each order that did not fit under its caps before the cutoff.
+    """
+    COLUMNS = ('Symbol', 'Market', 'Time', 'Side', 'Shares', 'Status')
+
+    def __init__(self, symbols, markets, times: np.ndarray, shares: np.ndarray, unfilled: np.ndarray,
+                 buy: np.ndarray):
+        self.symbols = np.asarray(symbols)
+        self.markets = np.asarray(markets)
+        self.times = times
+        self.shares = shares
+        self.unfilled = unfilled
+        self.buy = buy
+
+    def __len__(self):
+        return int(np.count_nonzero(self.shares))
+
+    def child_orders(self):
+        """Non-empty child orders in long format, by symbol then time."""
+        import pandas as pd
+
+        rows, cols = np.nonzero(self.shares)
+        shares = self.shares[rows, cols]
+        return pd.DataFrame({'Symbol': self.symbols[rows], 'Market': self.markets[rows], 'Time': self.times[cols],
+                             'Side': np.where(shares > 0, 'Buy', 'Sell'), 'Shares': np.abs(shares)})
+
+    def unfilled_orders(self):
+        """Shares left unscheduled per symbol, for the orders that did not fit."""
+        import pandas as pd
+
+        rows = np.nonzero(self.unfilled)[0]
+        return pd.DataFrame({'Symbol': self.symbols[rows], 'Market': self.markets[rows],
+                             'Side': np.where(self.buy[rows], 'Buy', 'Sell'), 'Shares': self.unfilled[rows]})
+
+    def unfilled_csv(self) -> str:
+        """CSV rows (no header) of unfilled_orders(): Status 'Unfilled' and no time."""
+        buffer = io.StringIO()
+        rows = np.nonzero(self.unfilled)[0]
+        csv.writer(buffer).writerows(zip(self.symbols[rows], self.markets[rows], np.full(len(rows), ''),
+                                         np.where(self.buy[rows], 'Buy', 'Sell'), self.unfilled[rows],
+                                         np.full(len(rows), 'Unfilled')))
+        return buffer.getvalue()
+
+    def iter_csv(self, chunk_rows: int = 500, header: bool = True, unfilled: bool = True):
+        """
+        Stream the child orders as CSV text, `chunk_rows` symbols at a time, so
+        a large schedule is never rendered as one string. Orders that did not
+        fully fit follow as 'Unfilled' rows unless `unfilled` is False.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(self.COLUMNS)
+        times = np.datetime_as_string(self.times, unit='m')
+        for start in range(0, max(len(self.symbols), 1), chunk_rows):
+            block = self.shares[start:start + chunk_rows]
+            rows, cols = np.nonzero(block)
+            shares = block[rows, cols]
+            writer.writerows(zip(self.symbols[start + rows], self.markets[start + rows], times[cols],
+                                 np.where(shares > 0, 'Buy', 'Sell'), np.abs(shares),
+                                 np.full(len(rows), 'Scheduled')))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if unfilled:
+            yield self.unfilled_csv()
+
+
+def _fill_capped(target: np.ndarray, weights: np.ndarray, cap: np.ndarray) -> np.ndarray:
+    """
+    Split each row's target over its buckets in proportion to `weights` with
+    no bucket above the row's cap: the excess of capped buckets flows to the
+    others (water-filling). Solved exactly per row from the weights sorted
+    in decreasing order; whatever does not fit under the caps is left out.
+    """
+    cap = cap[:, None]
+    ws = -np.sort(-weights, axis=1)
+    cumw = np.cumsum(ws, axis=1)
+    rest = np.clip(1 - cumw, 0.0, None)  # weight of the buckets after k
+    k = np.arange(weights.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Volume placed when buckets 0..k are exactly at the cap
+        placed = np.where(ws > 0, cap * (k + 1) + cap / ws * rest, np.inf)
+        reached = placed >= target[:, None]
+        kstar = np.where(reached.any(axis=1), reached.argmax(axis=1), weights.shape[1] - 1)
+        rest_before = np.take_along_axis(np.concatenate([np.ones((len(ws), 1)), rest], axis=1),
+                                         kstar[:, None], axis=1)
+        level = (target[:, None] - cap * kstar[:, None]) / rest_before
+        return np.where(weights > 0, np.minimum(level * weights, cap), 0.0)
+
+
+def schedule_orders(positions, style: str = 'VWAP', cutoff: datetime.datetime = None,
+                    start: datetime.datetime = None, bucket_minutes: int = 5,
+                    curves: dict = None) -> ExecutionSchedule:
+    """
+    Turn each position's 'Target Exec Shrs' into child orders over
+    `bucket_minutes` buckets from `start` to `cutoff`.
+
+    VWAP follows the market's intraday volume curve, Inline spreads the order
+    evenly over the trading buckets and Limit on Close sends it all in the last
+    trading bucket before the cutoff. No child order exceeds 'Max Buy' (buys)
+    or 'Max Sell' (sells) shares; what does not fit is reported as unfilled.
+    Times are in each market's local time.
+
+    Timezone-aware `start` and `cutoff` are converted into each market's
+    local time (MARKET_TIMEZONES), so one cutoff is a different local time
+    per market; naive ones are taken as market-local times.
+
+    Args:
+        positions (pd.DataFrame): Hedge orders (Symbol, Market, Target Exec Shrs, Max Buy, Max Sell).
+        style (str): One of STYLES.
+        cutoff (datetime, optional): Last time to trade. Defaults to the end of today.
+        start (datetime, optional): First time to trade, e.g. now: buckets starting
+            earlier are left empty. Defaults to midnight of the cutoff date, i.e. the
+            whole cutoff day.
+        bucket_minutes (int): Bucket length.
+        curves (dict, optional): Market -> volume curve over the day's buckets,
+            overriding the defaults built from MARKET_SESSIONS.
+
+    Returns:
+        ExecutionSchedule
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown execution style: {style}")
+    cutoff = cutoff or datetime.datetime.combine(datetime.date.today(), datetime.time(23, 59))
+    start = start or datetime.datetime.combine(cutoff.date(), datetime.time(), tzinfo=cutoff.tzinfo)
+    if start >= cutoff:
+        raise ValueError("Cutoff must be after the start time")
+
+    curves = {**{m: volume_curve(s, bucket_minutes) for m, s in MARKET_SESSIONS.items()}, **(curves or {})}
+    markets = np.asarray(positions['Market'].astype(str))
+    names = sorted(set(markets))
+    unknown = set(names) - set(curves)
+    if unknown:
+        raise ValueError(f"No volume curve for markets: {sorted(unknown)}")
+    # Trading window of each market in its local time
+    windows = [(_market_time(start, m), _market_time(cutoff, m)) for m in names] or \
+        [(start.replace(tzinfo=None), cutoff.replace(tzinfo=None))]
+
+    # Common bucket grid over the whole days from start to cutoff (weekdays only)
+    days = np.arange(np.datetime64(min(s.date() for s, _ in windows)),
+                     np.datetime64(max(c.date() for _, c in windows)) + 1)
+    days = days[np.is_busday(days)]
+    if len(days) == 0:
+        raise ValueError("No trading day between the start and the cutoff")
+    per_day = 24 * 60 // bucket_minutes
+    offsets = np.arange(per_day) * np.timedelta64(bucket_minutes, 'm')
+    times = (days[:, None] + offsets[None, :]).ravel()
+    ends = times + np.timedelta64(bucket_minutes, 'm')
+    in_window = np.stack([(times >= np.datetime64(s)) & (ends <= np.datetime64(c)) for s, c in windows])
+
+    # One curve per market, tiled over the days; each symbol picks its market's row
+    grid = np.stack([np.tile(curves[m], len(days)) for m in names] or [np.zeros(len(times))]) * in_window
+    if style == 'Inline':
+        grid = (grid > 0).astype(float)
+    elif style == 'Limit on Close':
+        last = grid.shape[1] - 1 - np.argmax(grid[:, ::-1] > 0, axis=1)
+        grid = np.where(np.arange(grid.shape[1]) == last[:, None], grid > 0, 0.0)
+    total = grid.sum(axis=1, keepdims=True)
+    grid = np.divide(grid, total, out=np.zeros_like(grid), where=total > 0)
+    weights = grid[np.searchsorted(names, markets)]
+
+    target = np.asarray(positions['Target Exec Shrs'], dtype=float)
+    cap = np.where(target >= 0, np.asarray(positions['Max Buy'], dtype=float),
+                   np.asarray(positions['Max Sell'], dtype=float))
+    cap = np.where(np.isnan(cap), np.inf, np.abs(cap))  # no cap when missing
+    size = np.abs(target)
+
+    qty = size[:, None] * weights
+    over = (qty > cap[:, None]).any(axis=1)
+    if over.any():
+        qty[over] = _fill_capped(size[over], weights[over], cap[over])
+    # Round the running total so that whole-share children add up exactly
+    filled = np.round(np.cumsum(qty, axis=1))
+    shares = np.diff(filled, axis=1, prepend=0.0).astype(np.int64)
+    unfilled = (size - shares.sum(axis=1)).astype(np.int64)
+    shares *= np.where(target < 0, -1, 1)[:, None]
+    return ExecutionSchedule(positions['Symbol'], markets, times, shares, unfilled, buy=target >= 0)
+
+
+def iter_schedule_csv(positions, chunk_rows: int = 2000, **kwargs):
+    """
+    Schedule and stream `positions` as CSV `chunk_rows` orders at a time, so
+    memory stays bounded by one chunk's symbols x buckets matrix however many
+    orders there are; the 'Unfilled' rows come last. Keyword arguments go to
+    schedule_orders.
+    """
+    unfilled = []  # one row per order that did not fit: all written at the end
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        schedule = schedule_orders(positions.iloc[start:start + chunk_rows], **kwargs)
+        yield from schedule.iter_csv(header=start == 0, unfilled=False)
+        unfilled.append(schedule.unfilled_csv())
+    yield ''.join(unfilled)
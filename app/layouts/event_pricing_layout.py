@@ -1,6 +1,7 @@
 from dash import html, dcc, dash_table
 import dash_bootstrap_components as dbc
 from ..config import PRIMARY, SECONDARY, BACKGROUND
+from ..utils.figures import LIGHT_TEMPLATE
 
 
 def event_pricing_layout():
@@ -82,7 +83,36 @@ def event_pricing_layout():
                         html.P("* Heavier left tail -> elevated put vols; thiner right tail -> depressed call vols, ", style={'fontStyle': 'italic', 'marginTop': '0rem', 'marginBottom': '0rem'}),
                         html.P("exactly as seen in the skew chart on the left.", style={'fontStyle': 'italic', 'marginTop': '0rem'}),
                     ], width=4),
-                    dbc.Col(dcc.Graph(id='output-straddle-payoff-chart', figure={}, style={'width':'100%','aspectRatio':'4/3'}), width=4),
+                    dbc.Col([
+                        dcc.Graph(id='output-straddle-payoff-chart', figure={}, style={'width':'100%','aspectRatio':'4/3'}),
+                        dcc.RadioItems(
+                            id='payoff-strategy',
+                            options=[{'label': 'Straddle', 'value': 'straddle'}, {'label': 'Strangle', 'value': 'strangle'},
+                                     {'label': 'Risk Reversal', 'value': 'risk_reversal'}],
+                            value='straddle', inline=True, inputStyle={'marginRight': '0.25rem', 'marginLeft': '1rem'},
+                        ),
+                        # Figure styling for the clientside payoff chart
+                        dcc.Store(id='payoff-style', data={'template': LIGHT_TEMPLATE.to_plotly_json(), 'color': SECONDARY}),
+                    ], width=4),
+                ], className='mb-4'),
+                # Row 3: bump-and-reprice sensitivities
+                dbc.Row([
+                    dbc.Col(
+                        dbc.Card([
+                            dbc.CardHeader("Sensitivities", style={'borderBottom': f'2px solid {SECONDARY}'}),
+                            dbc.CardBody(
+                                dash_table.DataTable(
+                                    id='output-sensitivity-table', columns=[], data=[], page_size=12,
+                                    style_table={'overflowX': 'auto'},
+                                    style_header={'backgroundColor': PRIMARY, 'color': 'white', 'fontWeight': 'bold', 'fontSize': '0.85rem'},
+                                    style_cell={'textAlign': 'center', 'padding': '0.5rem', 'fontSize': '0.75rem'},
+                                    style_data_conditional=[{'if': {'row_index': 'odd'}, 'backgroundColor': BACKGROUND}]
+                                )
+                            )
+                        ], style={'boxShadow': '0 2px 8px rgba(0,0,0,0.1)'}),
+                        width=6
+                    ),
+                    dbc.Col(dcc.Graph(id='output-tornado-chart', figure={}, style={'width':'100%','aspectRatio':'4/3'}), width=6),
                 ], className='mb-4'),
             ], width=10)
         ])
@@ -1,11 +1,21 @@
 import pandas as pd
 from dash import html, dcc, dash_table
+from dash.dash_table.Format import Format, Scheme, Sign
 import dash_bootstrap_components as dbc
 from ..config import PRIMARY, SECONDARY, BACKGROUND
 
 
+def _column(positions, c):
+    # 'Spot % Move' is a decimal when positions are loaded compact: show it as '+0.8%'
+    if c == 'Spot % Move' and pd.api.types.is_float_dtype(positions[c]):
+        return {'name': c, 'id': c, 'type': 'numeric', 'format': Format(precision=1, scheme=Scheme.percentage, sign=Sign.positive)}
+    return {'name': c, 'id': c}
+
+
 def hedging_layout(positions):
-    columns = [{'name': c, 'id': c} for c in positions.columns]
+    # Only the columns are taken from positions: the table starts empty and
+    # update_hedge_table fills it when it is first shown
+    columns = [_column(positions, c) for c in positions.columns]
     return html.Div([
         html.H4("Hedging Orders", style={'textAlign': 'left', 'marginBottom': '1rem', 'color': PRIMARY}),
 
@@ -27,6 +37,7 @@ def hedging_layout(positions):
                 [
                     html.Div("Style:", style={'marginBottom': '0.25rem', 'fontWeight': 'bold'}),
                     dcc.Dropdown(
+                        id='style-dropdown',
                         options=[{'label': s,'value': s} for s in ['Limit on Close', 'Inline', 'VWAP']],
                         value='Limit on Close',
                         placeholder='Select Hedge Style'
@@ -54,9 +65,9 @@ def hedging_layout(positions):
                 dcc.Dropdown(
                     id='book-dropdown',
                     options=[
-                        {'label':'Book1','value':'B1'},
-                        {'label':'Book2','value':'B2'},
-                        {'label':'Book3','value':'B3'},
+                        {'label':'Book1','value':'Book1'},
+                        {'label':'Book2','value':'Book2'},
+                        {'label':'Book3','value':'Book3'},
                     ],
                     placeholder='Select books',
                     multi=True,
@@ -85,7 +96,7 @@ def hedging_layout(positions):
                             dash_table.DataTable(
                                 id='hedge-table',
                                 columns=columns,
-                                data=positions.to_dict('records'),
+                                data=[],
                                 page_size=15,
                                 style_table={'overflowX': 'auto', 'width': '100%'},
                                 style_header={'backgroundColor': PRIMARY, 'color': 'white', 'fontWeight': 'bold'},
@@ -100,6 +111,8 @@ def hedging_layout(positions):
                 dbc.Row([
                     dbc.Col(dbc.Button("Copy Orders", id='copy-orders-btn', color='warning'), width='auto'),
                     dbc.Col(dbc.Button("Download Orders", id='download-orders-btn', color='info'), width='auto'),
+                    # Plain link: the schedule is streamed by /api/hedging/schedule.csv
+                    dbc.Col(dbc.Button("Download Schedule", id='download-schedule-link', color='info', href='', external_link=True), width='auto'),
                 ], className='mt-4', align='center'),
                 dcc.Download(id='download-orders'),
             ], width=11),
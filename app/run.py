@@ -1,14 +1,22 @@
+import importlib
 from dash import Dash, html
 import dash_bootstrap_components as dbc
 from .callbacks.event_pricing_callbacks import register_event_pricing_callbacks
 from .callbacks.hedging_callbacks import register_hedging_callbacks
 from .callbacks.navigation_callbacks import register_navigation_callbacks
-from .config import PRIMARY, SECONDARY, BACKGROUND
-from .utils.data_loader import load_positions
+from .api.event_pricing_api import register_event_pricing_api
+from .api.hedging_api import register_hedging_api
+from .config import PRIMARY, SECONDARY, BACKGROUND, LOG_ROTATION, LOG_PER_WORKER, PRELOAD, SNAPSHOT_DIR
+from .utils.data_loader import get_positions, positions_version
 from .utils.log_config import setup_logging
+from .utils.metrics import register_metrics
+from .utils.http_cache import enable_compression, register_response_cache
 
 
-setup_logging()
+setup_logging(rotation=LOG_ROTATION, per_worker=LOG_PER_WORKER)
+
+# Heavy modules preload() imports up front (otherwise loaded on first use)
+PRELOAD_MODULES = ('scipy.special', 'scipy.optimize', 'pyarrow.parquet', '.event_pricing', '.layouts')
 
 def generate_layout():
     header = html.Div([
@@ -54,17 +62,37 @@ def generate_layout():
     content = html.Div(id='page-content', style={'marginLeft': '20rem', 'padding': '2rem'})
     return html.Div([header, sidebar, content])
 
-def create_app():
+def preload():
+    """
+    Import the heavy modules and load page data up front instead of on first
+    use, e.g. once in the gunicorn master (--preload) so forked workers share it.
+    """
+    from .event_pricing.snapshot import get_snapshot
+
+    # Imported for their side effect only: loading them into sys.modules
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module, __package__)
+    get_positions()
+    get_snapshot(SNAPSHOT_DIR)
+
+
+def create_app(preload_data: bool = PRELOAD):
     external_stylesheets = [dbc.themes.FLATLY]  # theme
     app = Dash(__name__, external_stylesheets=external_stylesheets, suppress_callback_exceptions=True)
     server = app.server  # expose for deployment
+    enable_compression(server)  # first, so it compresses the final response
 
-    positions = load_positions()
+    if preload_data:
+        preload()
 
     app.layout = generate_layout()
     register_event_pricing_callbacks(app)
-    register_hedging_callbacks(app, positions)
-    register_navigation_callbacks(app, positions)
+    register_hedging_callbacks(app, get_positions)
+    register_navigation_callbacks(app, get_positions)
+    register_event_pricing_api(app)
+    register_hedging_api(app, get_positions)
+    register_metrics(app)  # must come after all callbacks are registered
+    register_response_cache(app, data_version=positions_version)
 
     return app
 
@@ -1,11 +1,82 @@
-import pandas as pd
 import os
 import warnings
 import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from .metrics import timed_loader
+from ..config import COMPACT_FRAMES
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-def load_positions() -> pd.DataFrame:
+POSITIONS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'positions.parquet')
+
+
+def parse_pct(s: 'pd.Series') -> 'pd.Series':
+    """Parse strings such as '+0.8%' into decimals (0.008)."""
+    return s.astype(str).str.rstrip('%').astype(float) / 100
+
+
+def format_pct(s: 'pd.Series') -> 'pd.Series':
+    """Format decimals (0.008) as strings such as '+0.8%': the inverse of parse_pct."""
+    return s.map('{:+.1%}'.format, na_action='ignore')
+
+
+def export_positions(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    """Positions as in the source file, e.g. for CSV export: a parsed 'Spot % Move' is formatted back."""
+    import pandas as pd
+
+    if 'Spot % Move' in df.columns and pd.api.types.is_float_dtype(df['Spot % Move']):
+        return df.assign(**{'Spot % Move': format_pct(df['Spot % Move'])})
+    return df
+
+
+def compact_frame(df: 'pd.DataFrame', max_category_ratio: float = 0.5) -> 'pd.DataFrame':
+    """
+    Shrink the in-memory footprint of a frame without changing its values.
+
+    - String columns with few distinct values (at most `max_category_ratio`
+      of the rows) become categoricals, other object strings Arrow-backed strings.
+    - Integers are downcast to the smallest type holding their range.
+    - Floats become float32 only where every value round-trips exactly.
+
+    Args:
+        df (pd.DataFrame): Frame to compact (not modified).
+        max_category_ratio (float): Distinct/rows threshold for categoricals.
+
+    Returns:
+        pd.DataFrame: Compacted copy.
+    """
+    import numpy as np
+    import pandas as pd
+
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = s
+        elif pd.api.types.is_string_dtype(s):
+            if s.nunique(dropna=False) <= max_category_ratio * len(s):
+                out[col] = s.astype('category')
+            elif s.dtype == object:
+                out[col] = s.astype('string[pyarrow]')
+            else:  # already Arrow-backed (default string dtype from pandas 3)
+                out[col] = s
+        elif pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast='integer')
+        elif pd.api.types.is_float_dtype(s):
+            s32 = s.astype(np.float32)
+            exact = np.array_equal(s32.to_numpy(np.float64), s.to_numpy(np.float64), equal_nan=True)
+            out[col] = s32 if exact else s
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+@timed_loader
+def load_positions(path: str = None, compact: bool = False) -> 'pd.DataFrame':
     """
     Load and validate the positions data from a Parquet file.
 
@@ -15,16 +86,24 @@ def load_positions() -> pd.DataFrame:
     - WArns if missing value are present
     - Ensures the DataFrame is not empty
 
+    Args:
+        path (str, optional): Parquet file to load. Defaults to data/positions.parquet.
+        compact (bool): Parse 'Spot % Move' to a decimal float and shrink the
+            frame with compact_frame(); memory before/after is logged.
+
     Returns:
-        pd.DataFrame: Validate positions data.
+        pd.DataFrame: Validate positions data, with the source file's
+            positions_version() in `attrs['version']`.
     
     Raises:
         FileNotFoundError: If the file is missing.
         ValueError: If required columns are missing or data is empty.
         RuntimeWarning: If there are missing values.
     """
+    import pandas as pd  # deferred with the parquet engine until data is first needed
+
     logger.info("Loadding positions...")
-    path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'positions.parquet')
+    path = path or POSITIONS_PATH
 
     if not os.path.exists(path):
         raise FileNotFoundError(f"Positions file not found: {path}") # TODO: include errors in the logs
@@ -44,7 +123,34 @@ def load_positions() -> pd.DataFrame:
     # if not df['UnitDelta'].between(-1, 1).all():
     #     raise ValueError("Unit delta should be between -1 and 1.")
 
-    if df.empty():
+    if df.empty:
         raise ValueError("Loaded positions file is empty.") # TODO: include errors in the logs
 
-    return df
\ No newline at end of file
+    if compact:
+        before = df.memory_usage(deep=True).sum()
+        df = df.assign(**{'Spot % Move': parse_pct(df['Spot % Move'])})
+        df = compact_frame(df)
+        after = df.memory_usage(deep=True).sum()
+        logger.info("Positions memory: %.1f KB -> %.1f KB (%.1fx smaller)", before / 1024, after / 1024, before / after)
+
+    df.attrs['version'] = positions_version(path)
+    return df
+
+
+def positions_version(path: str = None) -> str:
+    """Token of the positions file (size and modification time), None if it is missing: changes whenever it is rewritten."""
+    try:
+        stat = os.stat(path or POSITIONS_PATH)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+@lru_cache(maxsize=1)
+def _positions(version: str) -> 'pd.DataFrame':
+    return load_positions(compact=COMPACT_FRAMES)
+
+
+def get_positions() -> 'pd.DataFrame':
+    """Positions loaded on first use and shared by every callback; reloaded when the file changes."""
+    return _positions(positions_version())
@@ -0,0 +1,26 @@
+import plotly.io as pio
+import plotly.graph_objects as go
+
+# Layout settings that matter for 2D bar/line charts
+LAYOUT_KEYS = ('autotypenumbers', 'colorway', 'font', 'hovermode', 'hoverlabel',
+               'paper_bgcolor', 'plot_bgcolor', 'title', 'xaxis', 'yaxis')
+
+
+def trimmed_template(name: str = 'plotly_white', trace_types: tuple = ('bar', 'scatter')) -> go.layout.Template:
+    """
+    Subset of a built-in Plotly template covering only the layout keys and
+    trace types our charts use. A named template is otherwise serialized in
+    full (~7KB: polar, ternary, geo, colorscales, every trace type) into
+    every figure of every callback response.
+
+    Returned as a Template object: a plain dict passed to update_layout would
+    be merged into the default template instead of replacing it.
+    """
+    full = pio.templates[name].to_plotly_json()
+    return go.layout.Template({
+        'layout': {k: v for k, v in full['layout'].items() if k in LAYOUT_KEYS},
+        'data': {t: full['data'][t] for t in trace_types if t in full['data']},
+    })
+
+
+LIGHT_TEMPLATE = trimmed_template()
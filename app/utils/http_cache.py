@@ -0,0 +1,149 @@
+import json
+import hashlib
+import logging
+import threading
+from typing import Callable
+from collections import OrderedDict
+from flask import Response, g, request
+from .metrics import record_cache
+from ..config import ETAG_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_PATH = '_dash-update-component'
+
+# Callbacks whose response is fully determined by their request body
+CACHEABLE_CALLBACKS = ('update_event_pricing', 'update_sensitivities', 'update_hedge_table')
+
+
+class LRUDict:
+    """Small thread-safe LRU mapping."""
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def enable_compression(server, algorithms: tuple = ('br', 'gzip')):
+    """
+    Compress responses (brotli, falling back to gzip) with flask-compress.
+    Call it before any other after_request hook is registered so that
+    compression runs last, on the final body.
+    """
+    try:
+        from flask_compress import Compress
+    except ImportError:
+        logger.warning("flask-compress is not installed: responses are sent uncompressed.")
+        return
+    server.config.setdefault('COMPRESS_ALGORITHM', list(algorithms))
+    Compress(server)
+
+
+def _normalize_inputs(items):
+    # Our callbacks only test n_clicks for truthiness, so the click count must not
+    # make otherwise identical requests look different.
+    out = []
+    for item in items or []:
+        if isinstance(item, list):  # pattern-matching inputs
+            out.append(_normalize_inputs(item))
+        elif item.get('property') == 'n_clicks':
+            out.append({**item, 'value': bool(item.get('value'))})
+        else:
+            out.append(item)
+    return out
+
+
+def request_key(body: dict, version: str = None) -> str:
+    """Hash of the parts of a callback request that determine its response, plus the data version."""
+    key = {
+        'version': version,
+        'output': body.get('output'),
+        'inputs': _normalize_inputs(body.get('inputs')),
+        'state': _normalize_inputs(body.get('state')),
+        'changed': sorted(body.get('changedPropIds') or []),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _if_none_match() -> set:
+    # Strip quotes, weak markers and the ':br'/':gzip' suffix flask-compress appends
+    values = set()
+    for tag in request.headers.get('If-None-Match', '').split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"').split(':')[0]
+        if tag:
+            values.add(tag)
+    return values
+
+
+def register_response_cache(app, callbacks: tuple = CACHEABLE_CALLBACKS, maxsize: int = ETAG_CACHE_SIZE,
+                            data_version: Callable[[], str] = None):
+    """
+    Content-hashed ETags for deterministic callback responses.
+
+    Every response of a listed callback gets an ETag (hash of its JSON body).
+    A request carrying a matching If-None-Match is answered with an empty 304:
+    before running the callback when the same request was answered recently
+    (request hash -> ETag is kept in an LRU), otherwise after running it,
+    which still saves the transfer. assets/etag_cache.js makes the browser
+    send If-None-Match and reuse its copy of the body on 304. `data_version`
+    (e.g. positions_version) is part of the request hash, so a request is
+    never answered from before the data changed.
+    """
+    etags = LRUDict(maxsize)
+    cacheable_outputs = {output for output, entry in app.callback_map.items()
+                         if getattr(entry.get('callback'), '__name__', None) in callbacks}
+    server = app.server
+
+    @server.before_request
+    def callback_not_modified():
+        if request.method != 'POST' or not request.path.endswith(CALLBACK_PATH):
+            return None
+        body = request.get_json(silent=True) or {}
+        if body.get('output') not in cacheable_outputs:
+            return None
+        g.etag_key = request_key(body, data_version() if data_version else None)
+        etag = etags.get(g.etag_key)
+        if etag is not None and etag in _if_none_match():
+            record_cache('callback_etag', hit=True)
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+        return None
+
+    @server.after_request
+    def callback_etag(response):
+        key = g.get('etag_key')
+        if key is None or response.status_code != 200:
+            return response
+        etag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+        etags.put(key, etag)
+        if etag in _if_none_match():
+            record_cache('callback_etag', hit=True)
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+        record_cache('callback_etag', hit=False)
+        response.headers['ETag'] = f'"{etag}"'
+        return response
+
+    return etags
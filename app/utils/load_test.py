@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+import numpy as np
+from .startup_profile import ROOT_DIR
+from .http_cache import CALLBACK_PATH
+
+EVENT_INPUTS = [
+    ('compute-btn', 'n_clicks'), ('input-s0', 'value'), ('input-ann-vol', 'value'), ('input-r', 'value'),
+    ('input-q', 'value'), ('input-normal-days', 'value'), ('input-non-tdays', 'value'),
+    ('input-event-days', 'value'), ('input-event-multiplier', 'value'), ('input-prob-up', 'value'),
+    ('input-target-delta', 'value'),
+]
+# Form defaults: also the inputs served from the snapshot
+EVENT_DEFAULTS = [100.0, 30.0, 0.0, 0.0, 7, 2, 1, 2.0, 90.0, 25.0]
+EVENT_OUTPUTS = [
+    ('output-vol', 'children'), ('output-table', 'data'), ('output-table', 'columns'),
+    ('output-iv-chart', 'figure'), ('output-premium-chart', 'figure'), ('output-price-comp-chart', 'figure'),
+    ('output-skew-chart', 'figure'), ('output-distribution-chart', 'figure'),
+]
+SENSITIVITY_OUTPUTS = [('output-sensitivity-table', 'data'), ('output-sensitivity-table', 'columns'),
+                       ('output-tornado-chart', 'figure')]
+PAGES = ['subtab-screener', 'subtab-backtester', 'subtab-eventpricing', 'subtab-hedging', 'subtab-pnlanalytics']
+MARKETS = ['US', 'EU', 'HK', 'AU', 'IN', 'JP']
+BOOKS = ['Book1', 'Book2', 'Book3']  # the positions' 'Book' values, as offered by the book dropdown
+
+
+def callback_request(outputs: list, inputs: list, state: list = (), changed: list = ()) -> dict:
+    """
+    Body of a /_dash-update-component request, as the Dash renderer sends it.
+
+    Args:
+        outputs (list): (id, property) pairs.
+        inputs (list): (id, property, value) triples.
+        state (list): (id, property, value) triples.
+        changed (list): 'id.property' of the inputs that triggered the callback.
+    """
+    if len(outputs) == 1:
+        output = '{}.{}'.format(*outputs[0])
+        outputs = {'id': outputs[0][0], 'property': outputs[0][1]}
+    else:
+        output = '..' + '...'.join(f'{i}.{p}' for i, p in outputs) + '..'
+        outputs = [{'id': i, 'property': p} for i, p in outputs]
+    return {
+        'output': output,
+        'outputs': outputs,
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+        'state': [{'id': i, 'property': p, 'value': v} for i, p, v in state],
+        'changedPropIds': list(changed),
+    }
+
+
+def _event_values(rng: random.Random) -> list:
+    # A third of the Computes use the form defaults (snapshot and ETag hits), the rest vary
+    if rng.random() < 1 / 3:
+        return list(EVENT_DEFAULTS)
+    return [round(rng.uniform(20, 400), 1), round(rng.uniform(15, 80), 1), rng.choice([0.0, 2.5, 5.0]),
+            rng.choice([0.0, 1.0]), rng.randint(3, 20), rng.randint(0, 4), rng.randint(1, 2),
+            rng.choice([1.5, 2.0, 3.0, 4.0]), rng.choice([50.0, 60.0, 75.0, 90.0]), rng.choice([10.0, 25.0])]
+
+
+def user_session(rng: random.Random):
+    """
+    One visit of a typical user: open Event Pricing and Compute a few times
+    with varied inputs, then open Hedging, filter the table and download.
+
+    Yields:
+        tuple: (callback name, request body)
+    """
+    nav = {page: 0 for page in PAGES}
+
+    def navigate(page):
+        nav[page] += 1
+        inputs = [(p, 'n_clicks', nav[p] or None) for p in PAGES]
+        return 'render_content', callback_request([('page-content', 'children')], inputs, changed=[f'{page}.n_clicks'])
+
+    # Sidebar toggles, payoff chart and schedule link run in the browser: no requests
+    yield navigate('subtab-eventpricing')
+    for click in range(1, rng.randint(2, 5)):
+        inputs = [(i, p, v) for (i, p), v in zip(EVENT_INPUTS, [click] + _event_values(rng))]
+        yield 'update_event_pricing', callback_request(EVENT_OUTPUTS, inputs, changed=['compute-btn.n_clicks'])
+        # Chained on the filled pricing table (only its presence matters to the server)
+        yield 'update_sensitivities', callback_request(
+            SENSITIVITY_OUTPUTS, [('output-table', 'data', [{'Scenario': 'Pre'}, {'Scenario': 'Post'}])],
+            state=inputs[1:], changed=['output-table.data'])
+
+    yield navigate('subtab-hedging')
+    market, books = None, []
+    for click in range(1, rng.randint(2, 4)):
+        market = rng.choice(MARKETS + [None])
+        books = rng.sample(BOOKS, rng.randint(0, 2))
+        inputs = [('generate-btn', 'n_clicks', click), ('clear-btn', 'n_clicks', None),
+                  ('mkt-dropdown', 'value', market), ('book-dropdown', 'value', books)]
+        yield 'update_hedge_table', callback_request(
+            [('hedge-table-container', 'style'), ('hedge-table', 'data'), ('mkt-dropdown', 'value'),
+             ('book-dropdown', 'value')], inputs, changed=['mkt-dropdown.value' if click > 1 else 'generate-btn.n_clicks'])
+    yield 'download_orders', callback_request(
+        [('download-orders', 'data')], [('download-orders-btn', 'n_clicks', 1)],
+        state=[('mkt-dropdown', 'value', market), ('book-dropdown', 'value', books)],
+        changed=['download-orders-btn.n_clicks'])
+
+
+def run_load(url: str, users: int = 8, duration: float = 30.0, think_time: float = 0.0, seed: int = 0) -> tuple:
+    """
+    Replay user sessions against the app at `url` from `users` concurrent
+    threads (one keep-alive connection each) for `duration` seconds.
+
+    Returns:
+        tuple: ({callback name: [(seconds, ok), ...]}, wall seconds)
+    """
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path.rstrip('/') + '/' + CALLBACK_PATH
+    headers = {'Content-Type': 'application/json', 'Accept-Encoding': 'br, gzip'}
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(i):
+        rng = random.Random(seed * 1_000 + i)
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=120)
+        while time.perf_counter() < deadline:
+            for name, body in user_session(rng):
+                if time.perf_counter() >= deadline:
+                    break
+                start = time.perf_counter()
+                try:
+                    conn.request('POST', path, json.dumps(body), headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status in (200, 204)
+                except (OSError, http.client.HTTPException):
+                    ok = False
+                    conn.close()
+                    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=120)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    samples[name].append((elapsed, ok))
+                if think_time:
+                    time.sleep(rng.expovariate(1 / think_time))
+        conn.close()
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return dict(samples), time.perf_counter() - start
+
+
+def summarize(samples: dict, wall: float) -> list:
+    """Requests, errors, throughput and p50/p95/p99 latency (ms) per callback, plus an 'all' row."""
+    rows = []
+    everything = [sample for name in sorted(samples) for sample in samples[name]]
+    for name, values in sorted(samples.items()) + [('all', everything)]:
+        latencies = np.array([seconds for seconds, _ in values]) * 1e3
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+        rows.append({'callback': name, 'requests': len(values), 'errors': sum(not ok for _, ok in values),
+                     'rps': len(values) / wall, 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99})
+    return rows
+
+
+def format_rows(rows: list) -> str:
+    lines = [f"{'callback':<24}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+    for r in rows:
+        lines.append(f"{r['callback']:<24}{r['requests']:>9}{r['errors']:>8}{r['rps']:>9.1f}"
+                     f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+    return '\n'.join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, threads: int, port: int, timeout: float = 60.0) -> subprocess.Popen:
+    """Start `gunicorn app:server` on localhost and wait until it answers."""
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', str(threads),
+                             '--bind', f'127.0.0.1:{port}', '--timeout', '120', 'app:server'],
+                            cwd=ROOT_DIR, env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_dash-layout', timeout=5).read()
+            return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise TimeoutError(f"Server did not start within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test of the Dash callbacks.")
+    parser.add_argument('--configs', nargs='+', default=['1x1', '1x4', '2x2', '4x1'],
+                        help="Server configurations to compare as <workers>x<threads> (gunicorn).")
+    parser.add_argument('--url', help="Test an already running server instead of starting gunicorn.")
+    parser.add_argument('--users', type=int, default=8, help="Concurrent simulated users.")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds of load per configuration.")
+    parser.add_argument('--warmup', type=float, default=5.0, help="Unrecorded seconds of load first.")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean pause between a user's requests.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    targets = [(args.url, args.url)] if args.url else [(config, None) for config in args.configs]
+    results = []
+    for label, url in targets:
+        proc = None
+        if url is None:
+            workers, threads = (int(x) for x in label.split('x'))
+            port = _free_port()
+            proc = start_server(workers, threads, port)
+            url = f'http://127.0.0.1:{port}'
+        try:
+            if args.warmup:  # lazy imports, data loading, first-request costs
+                run_load(url, args.users, args.warmup, args.think_time, seed=args.seed + 1)
+            samples, wall = run_load(url, args.users, args.duration, args.think_time, seed=args.seed)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+        rows = summarize(samples, wall)
+        print(f"\n== {label}: {args.users} users, {wall:.1f}s\n{format_rows(rows)}")
+        results.append((label, rows[-1]))
+
+    if len(results) > 1:
+        print(f"\n== comparison (all callbacks)\n{'config':<24}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for label, r in results:
+            print(f"{label:<24}{r['rps']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,204 @@
 import os
+import sys
+import copy
+import json
+import uuid
+import fcntl
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from flask import g, has_request_context, request
+
+_settings = {}
+_queue_handler = None
+_listener = None
+_hooks_registered = False
+_stopped = False
+_forked = False
+_slot = None  # (lock file, slot number) of this process's per-worker log file
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id and callback id (if any) to every record."""
+    def filter(self, record):
+        if has_request_context():
+            if 'request_id' not in g:
+                g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+            record.request_id = g.request_id
+            record.callback_id = g.get('callback_id')
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+    FIELDS = ('request_id', 'callback_id', 'duration_ms')
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'pid': record.process,
+            'message': record.getMessage(),
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Only render the message and traceback on the caller's thread; the JSON
+        # formatting and the disk write happen on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _per_worker() -> bool:
+    if _settings['per_worker'] is not None:
+        return _settings['per_worker']
+    # Auto: forked workers must not share (and rotate) one file
+    return _forked or 'gunicorn' in sys.modules
+
+
+def _claim_slot(name: str) -> int:
+    """
+    Lowest worker slot not held by a live process. The slot's lock file stays
+    locked until this process exits, so a restarted worker takes over the file
+    of the one it replaces instead of adding a new one.
+    """
+    global _slot
+    if _slot is not None:
+        return _slot[1]
+    slot = 0
+    while True:
+        lock = open(os.path.join(_settings['log_dir'], f".{name}.{slot}.lock"), 'w')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            slot += 1
+            continue
+        _slot = (lock, slot)
+        return slot
+
+
+def _release_slot():
+    global _slot
+    if _slot is not None:
+        _slot[0].close()
+        _slot = None
+
+
+def _file_handler() -> logging.Handler:
+    log_file = _settings['log_file']
+    if _per_worker():
+        name, ext = os.path.splitext(log_file)
+        log_file = f"{name}.{_claim_slot(name)}{ext}"
+    log_path = os.path.join(_settings['log_dir'], log_file)
+
+    if _settings['rotation'] == 'time':
+        handler = TimedRotatingFileHandler(log_path, when=_settings['when'], backupCount=_settings['backup_count'])
+    else:
+        handler = RotatingFileHandler(log_path, maxBytes=_settings['max_bytes'], backupCount=_settings['backup_count'])
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _start_listener():
+    global _listener
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, _file_handler(), respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_after_fork():
+    # The listener thread does not survive fork (e.g. gunicorn --preload):
+    # start a fresh queue/listener (and per-worker file) in the child.
+    global _forked, _slot
+    _forked = True
+    if _slot is not None:
+        # Closing our copy keeps the parent's lock: the child claims its own slot
+        _slot[0].close()
+        _slot = None
+    if _queue_handler is not None and not _stopped:
+        _start_listener()
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def stop_logging():
+    """Flush queued records, stop the listener thread and detach the queue handler."""
+    global _queue_handler, _stopped
+    _stopped = True
+    _stop_listener()
+    _release_slot()
+    if _queue_handler is not None:
+        # Nobody reads the queue any more: records must not pile up on it
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def setup_logging(log_dir: str = "logs", log_file: str = "app.log", level=logging.INFO,
+                  rotation: str = "size", max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  when: str = "midnight", per_worker: bool = None):
+    """
+    Configure non-blocking JSON logging.
+
+    Callers only push records onto an in-memory queue; a QueueListener thread
+    formats them and writes to a rotating file, so disk I/O never sits on the
+    request path.
+
+    Args:
+        log_dir (str): Directory for log files.
+        log_file (str): Log file name.
+        level: Root logger level.
+        rotation (str): 'size' (RotatingFileHandler) or 'time' (TimedRotatingFileHandler).
+        max_bytes (int): Size at which a 'size' rotated file rolls over.
+        backup_count (int): Number of rotated files to keep.
+        when (str): Rollover interval for 'time' rotation.
+        per_worker (bool, optional): Write to <log_file>.<slot> so that each gunicorn
+            worker owns its file instead of interleaving lines (and rollovers) in a
+            shared one. Slots are numbered from 0 and reused by restarted workers.
+            Defaults to True under gunicorn or in a forked child.
+    """
+    global _queue_handler, _hooks_registered, _stopped
+    if rotation not in ('size', 'time'):
+        raise ValueError(f"Unknown log rotation: {rotation}")
 
-def setup_logging(log_dir: str = "logs", log_file: str = "app.log", level=logging.INFO):
     os.makedirs(log_dir, exist_ok=True)
-    log_path = os.path.join(log_dir, log_file)
-
-    logging.basicConfig(
-        filename=log_path,
-        filemode='a', # append mode
-        level=level,
-        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s'
-    )
\ No newline at end of file
+    _settings.update(log_dir=log_dir, log_file=log_file, rotation=rotation, max_bytes=max_bytes,
+                     backup_count=backup_count, when=when, per_worker=per_worker)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _queue_handler is not None:  # reconfigure: swap the listener, keep the handler
+        _stop_listener()
+    else:
+        _queue_handler = _QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(RequestContextFilter())
+        root.addHandler(_queue_handler)
+    if not _hooks_registered:
+        atexit.register(stop_logging)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_listener_after_fork)
+        _hooks_registered = True
+    _stopped = False
+    _start_listener()
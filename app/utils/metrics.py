@@ -0,0 +1,353 @@
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import bisect
+import fcntl
+import logging
+import tempfile
+import threading
+from functools import wraps
+from flask import Response, g, has_request_context, request
+from ..config import METRICS_DIR, SERVER_TIMING
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+FLUSH_INTERVAL = 1.0  # seconds between writes of a worker's series file
+
+PROCESS_FILE = re.compile(r'(\d+)\.json')
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram rendered in the Prometheus text format.
+    """
+    def __init__(self, name: str, doc: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 3))
+            series[i] += 1  # i == len(buckets) is the +Inf bucket
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {k: list(v) for k, v in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self, snapshot: dict = None) -> list:
+        """Render this process's series, or `snapshot` (e.g. summed over workers)."""
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        if snapshot is None:
+            snapshot = self.snapshot()
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), series[:-2]):
+                cumulative += n
+                le = '+Inf' if bound == float('inf') else str(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """
+    Thread-safe monotonic counter rendered in the Prometheus text format.
+    """
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc = doc
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._series.get(tuple(sorted(labels.items())), 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._series)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self, snapshot: dict = None) -> list:
+        """Render this process's series, or `snapshot` (e.g. summed over workers)."""
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        if snapshot is None:
+            snapshot = self.snapshot()
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}_total{_format_labels(key)} {value:g}")
+        return lines
+
+
+CALLBACK_WALL = Histogram('dash_callback_wall_seconds', 'Wall time spent in a Dash callback.')
+CALLBACK_CPU = Histogram('dash_callback_cpu_seconds', 'CPU time spent in a Dash callback.')
+CALLBACK_BYTES_IN = Histogram('dash_callback_request_bytes', 'Size of the callback request payload.', BYTES_BUCKETS)
+CALLBACK_BYTES_OUT = Histogram('dash_callback_response_bytes', 'Size of the callback response payload.', BYTES_BUCKETS)
+LOADER_WALL = Histogram('data_loader_wall_seconds', 'Wall time spent in a data loader.')
+LOADER_CPU = Histogram('data_loader_cpu_seconds', 'CPU time spent in a data loader.')
+LOADER_BYTES = Histogram('data_loader_bytes', 'In-memory size of the data returned by a loader.', BYTES_BUCKETS)
+CACHE_REQUESTS = Counter('cache_requests', 'Cache lookups by cache name and result (hit/miss).')
+
+METRICS = [CALLBACK_WALL, CALLBACK_CPU, CALLBACK_BYTES_IN, CALLBACK_BYTES_OUT,
+           LOADER_WALL, LOADER_CPU, LOADER_BYTES, CACHE_REQUESTS]
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a lookup against a named cache; hit rate = hit / (hit + miss)."""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+
+def _metrics_dir() -> str:
+    if METRICS_DIR:
+        return METRICS_DIR
+    if 'gunicorn' in sys.modules:
+        # Evaluated in the workers, whose parent is the master they share
+        return os.path.join(tempfile.gettempdir(), f"dash_metrics_{os.getppid()}")
+    return None
+
+
+def _read(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    return {name: {tuple(map(tuple, key)): value for key, value in series} for name, series in data.items()}
+
+
+def _write(path: str, snapshots: dict):
+    # Write then rename: readers never see a partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({name: [[key, value] for key, value in series.items()] for name, series in snapshots.items()}, f)
+    os.replace(tmp, path)
+
+
+def _merge(total: dict, snapshots: dict):
+    for name, series in snapshots.items():
+        acc = total.setdefault(name, {})
+        for key, value in series.items():
+            prev = acc.get(key)
+            if prev is None:
+                acc[key] = value
+            elif isinstance(value, list):  # histogram: bucket counts, sum, count
+                acc[key] = [a + b for a, b in zip(prev, value)]
+            else:
+                acc[key] = prev + value
+
+
+_flushed = False  # this process has written its series file (and registered the exit flush)
+_dirty = False
+_flusher = None
+
+
+def flush_metrics(directory: str = None):
+    """Write this process's series to `<directory>/<pid>.json` (default: the shared metrics directory)."""
+    global _flushed
+    directory = directory or _metrics_dir()
+    if directory is None:
+        return
+    if not _flushed:
+        atexit.register(flush_metrics, directory)  # keep the last observations of an exiting worker
+        _flushed = True
+    os.makedirs(directory, exist_ok=True)
+    _write(os.path.join(directory, f"{os.getpid()}.json"), {m.name: m.snapshot() for m in METRICS})
+
+
+def _collect(directory: str) -> dict:
+    """
+    Sum the series files of every process in `directory`. Files of exited
+    processes are folded into archive.json, so that their counts (and the
+    counters) never go backwards.
+    """
+    total, archive = {}, os.path.join(directory, 'archive.json')
+    with open(os.path.join(directory, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archived = _read(archive) if os.path.exists(archive) else {}
+        exited = []
+        for name in os.listdir(directory):
+            match = PROCESS_FILE.fullmatch(name)
+            if not match:
+                continue
+            path = os.path.join(directory, name)
+            if _process_alive(int(match.group(1))):
+                _merge(total, _read(path))
+            else:
+                _merge(archived, _read(path))
+                exited.append(path)
+        if exited:
+            _write(archive, archived)
+            for path in exited:
+                os.remove(path)
+    _merge(total, archived)
+    return total
+
+
+def render_metrics(directory: str = None) -> str:
+    """
+    Prometheus text of every metric: summed over the processes writing to the
+    shared metrics directory (`directory` or METRICS_DIR, automatic under
+    gunicorn), else this process's series only.
+    """
+    directory = directory or _metrics_dir()
+    if directory is None:
+        snapshots = {m.name: m.snapshot() for m in METRICS}
+    else:
+        flush_metrics(directory)
+        snapshots = _collect(directory)
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render(snapshots.get(metric.name, {})))
+    return '\n'.join(lines) + '\n'
+
+
+def _flush_loop():
+    global _dirty
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        if _dirty:
+            _dirty = False
+            try:
+                flush_metrics()
+            except OSError:
+                logger.warning("Could not write the metrics file", exc_info=True)
+
+
+def _mark_dirty():
+    # Series files are written by a background thread, at most every FLUSH_INTERVAL
+    global _dirty, _flusher
+    _dirty = True
+    if _flusher is None and _metrics_dir() is not None:
+        _flusher = threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True)
+        _flusher.start()
+
+
+def _reset_after_fork():
+    # A forked worker starts from zero: the master's series are not its own
+    global _flushed, _dirty, _flusher
+    _flushed, _dirty, _flusher = False, False, None
+    for metric in METRICS:
+        metric.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _payload_size(obj) -> int:
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    if hasattr(obj, 'memory_usage'):  # pandas DataFrame
+        return int(obj.memory_usage(index=True).sum())
+    return 0
+
+
+def timed_loader(func):
+    """Decorator recording wall time, CPU time and output size of a data loader."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        result = func(*args, **kwargs)
+        LOADER_WALL.observe(time.perf_counter() - wall0, loader=func.__name__)
+        LOADER_CPU.observe(time.thread_time() - cpu0, loader=func.__name__)
+        LOADER_BYTES.observe(_payload_size(result), loader=func.__name__)
+        return result
+    return wrapper
+
+
+def _timed_callback(func):
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if has_request_context():
+            g.callback_id = name
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.thread_time() - cpu0
+            logger.info("Callback %s took %.1f ms", name, wall * 1000, extra={'duration_ms': round(wall * 1000, 3)})
+            CALLBACK_WALL.observe(wall, callback=name)
+            CALLBACK_CPU.observe(cpu, callback=name)
+            if has_request_context():
+                CALLBACK_BYTES_IN.observe(request.content_length or 0, callback=name)
+                g.callback_timings = getattr(g, 'callback_timings', []) + [(name, wall, cpu)]
+    return wrapper
+
+
+def _record_response(response):
+    # Response size is measured here, after Dash has serialized the outputs
+    for name, wall, cpu in getattr(g, 'callback_timings', ()):
+        CALLBACK_BYTES_OUT.observe(response.calculate_content_length() or 0, callback=name)
+    _mark_dirty()
+    return response
+
+
+def _add_server_timing(response):
+    timings = getattr(g, 'callback_timings', ())
+    if timings:
+        response.headers['Server-Timing'] = ', '.join(
+            f'{name};dur={wall * 1000:.1f};desc="cpu {cpu * 1000:.1f}ms"' for name, wall, cpu in timings
+        )
+    return response
+
+
+def register_metrics(app, server_timing: bool = SERVER_TIMING):
+    """
+    Instrument every server-side callback registered so far on `app` and
+    expose the collected histograms on a Prometheus-format /metrics route.
+    Call it after all register_*_callbacks.
+
+    With several worker processes (gunicorn, or METRICS_DIR set), each one
+    writes its series to the shared metrics directory within FLUSH_INTERVAL
+    seconds of a request and /metrics sums them, whichever worker answers.
+    """
+    for entry in app.callback_map.values():
+        if entry.get('callback') is not None:
+            entry['callback'] = _timed_callback(entry['callback'])
+
+    server = app.server
+    server.after_request(_record_response)
+    if server_timing:
+        server.after_request(_add_server_timing)
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
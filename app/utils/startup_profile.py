@@ -0,0 +1,63 @@
+import os
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# What a gunicorn worker does on boot: import the package and build the app
+STARTUP = "import time; t = time.perf_counter(); import app; app.server; print(time.perf_counter() - t)"
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse `python -X importtime` output into (module, self_us, cumulative_us) rows.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile_startup(preload: bool = False) -> tuple:
+    """
+    Cold-start the app in a fresh interpreter.
+
+    Returns:
+        tuple: (seconds to build the app, parsed import-time rows)
+    """
+    env = dict(os.environ, APP_PRELOAD='1' if preload else '0')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP],
+                          cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+    seconds = float(proc.stdout.strip().splitlines()[-1])
+    return seconds, parse_importtime(proc.stderr)
+
+
+def top_packages(rows: list, n: int = 15) -> list:
+    """Self import time summed per top-level package, largest first."""
+    totals = defaultdict(int)
+    for module, self_us, _ in rows:
+        totals[module.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the app cold start.")
+    parser.add_argument('--top', type=int, default=15, help="Number of packages to list.")
+    parser.add_argument('--runs', type=int, default=3, help="Cold starts per mode (best is reported).")
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        runs = [profile_startup(preload) for _ in range(args.runs)]
+        seconds, rows = min(runs, key=lambda run: run[0])
+        print(f"\n== {'preload' if preload else 'lazy'} startup: {seconds:.3f}s, {len(rows)} modules imported")
+        for package, self_us in top_packages(rows, args.top):
+            print(f"  {package:<30} {self_us / 1e3:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
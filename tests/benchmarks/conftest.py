@@ -0,0 +1,81 @@
+import os
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# The suite needs the pytest-benchmark plugin (pip install pytest-benchmark)
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+POSITIONS_PATH = os.path.join(ROOT_DIR, 'data', 'positions.parquet')
+
+POSITION_SIZES = [30, 1_000, 10_000, 100_000]
+STRIKE_SIZES = [50, 500, 5_000]
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks are slow: only run them when asked for explicitly
+    if config.getoption("benchmark_only", False) or config.getoption("benchmark_enable", False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark-only")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+def rounds_for(n: int) -> int:
+    """Fewer rounds for the larger inputs so the whole suite stays in minutes."""
+    return int(min(20, max(1, 5_000 // n)))
+
+
+def make_positions(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic positions frame with n rows, resampled from data/positions.parquet
+    the same way data/generate_positions.py does.
+    """
+    rng = np.random.default_rng(seed)
+    base = pd.read_parquet(POSITIONS_PATH)
+    df = base.iloc[rng.integers(0, len(base), size=n)].reset_index(drop=True)
+    df['Symbol'] = [f"Symbol{i+1}" for i in range(n)]
+    df['Book'] = rng.choice(['Book1', 'Book2', 'Book3'], size=n)
+    df['Market'] = rng.choice(['US', 'EU', 'HK', 'JP', 'AU', 'IN'], size=n)
+    df['Spot'] = rng.uniform(1, 200, size=n).round(2)
+    return df
+
+
+@pytest.fixture(scope='session', params=POSITION_SIZES, ids=lambda n: f"{n}pos")
+def positions(request):
+    return make_positions(request.param)
+
+
+@pytest.fixture(scope='session', params=POSITION_SIZES, ids=lambda n: f"{n}pos")
+def positions_file(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp('positions') / f"positions_{request.param}.parquet"
+    make_positions(request.param).to_parquet(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(params=STRIKE_SIZES, ids=lambda n: f"{n}K")
+def n_strikes(request):
+    return request.param
+
+
+class CallbackRecorder:
+    """
+    Stand-in for a Dash app that keeps the undecorated callback functions,
+    so the register_* closures can be timed without a running server.
+    """
+    def __init__(self):
+        self.callbacks = {}
+
+    def callback(self, *args, **kwargs):
+        def wrap(func):
+            self.callbacks[func.__name__] = func
+            return func
+        return wrap
+
+    def clientside_callback(self, *args, **kwargs):
+        pass
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from app.event_pricing import BlackScholes
+from .conftest import rounds_for
+
+S, T, R, Q, SIGMA = 100.0, 10 / 252, 0.0, 0.0, 0.30
+
+
+@pytest.mark.benchmark(group="calc_price")
+def test_calc_price(benchmark, n_strikes):
+    strikes = np.linspace(75, 125, n_strikes)
+    prices = benchmark(BlackScholes.calc_price, S, strikes, T, R, Q, SIGMA, True)
+    assert prices.shape == (n_strikes,)
+
+
+@pytest.mark.benchmark(group="find_ivol")
+def test_find_ivol(benchmark, n_strikes):
+    strikes = np.linspace(90, 110, n_strikes)
+    prices = BlackScholes.calc_price(S, strikes, T, R, Q, SIGMA, True)
+
+    def run():
+        return [BlackScholes.find_ivol(p, S, K, T, R, Q, call=True) for p, K in zip(prices, strikes)]
+
+    ivols = benchmark.pedantic(run, rounds=rounds_for(n_strikes))
+    np.testing.assert_allclose(ivols, SIGMA, rtol=1e-6)
+
+
+@pytest.mark.benchmark(group="find_strike")
+def test_find_strike(benchmark, n_strikes):
+    deltas = np.linspace(0.05, 0.95, n_strikes)
+
+    def run():
+        return [BlackScholes.find_strike(S, T, R, Q, SIGMA, d, call=True) for d in deltas]
+
+    strikes = benchmark.pedantic(run, rounds=rounds_for(n_strikes))
+    assert np.all(np.diff(strikes) < 0)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from app.event_pricing import EventPricing
+from app.callbacks.event_pricing_callbacks import register_event_pricing_callbacks
+from .conftest import CallbackRecorder, rounds_for
+
+
+@pytest.fixture
+def ep():
+    return EventPricing()
+
+
+@pytest.mark.benchmark(group="event_pricing")
+def test_summary(benchmark, ep):
+    df = benchmark(ep.summary)
+    assert list(df['Scenario']) == ['Pre', 'Post']
+
+
+@pytest.mark.benchmark(group="event_pricing")
+def test_iv_shift(benchmark, ep):
+    df = benchmark(ep.iv_shift)
+    assert len(df) == 3
+
+
+@pytest.mark.benchmark(group="skew")
+def test_skew(benchmark, ep, n_strikes):
+    moneyness, ivs_pre, ivs_post = benchmark.pedantic(ep.skew, args=(n_strikes,), rounds=rounds_for(n_strikes))
+    assert len(ivs_pre) == len(ivs_post) == n_strikes
+
+
+@pytest.mark.benchmark(group="pdf")
+def test_pdf(benchmark, ep, n_strikes):
+    strikes, pdf_implied, pdf_lognormal = benchmark.pedantic(ep.pdf, args=(n_strikes,), rounds=rounds_for(n_strikes))
+    assert np.all(np.asarray(pdf_lognormal) >= 0)
+
+
+@pytest.mark.benchmark(group="callbacks")
+def test_update_event_pricing(benchmark, tmp_path, monkeypatch):
+    # Time the live valuation: no snapshot can serve these inputs
+    monkeypatch.setattr('app.callbacks.event_pricing_callbacks.SNAPSHOT_DIR', str(tmp_path))
+    app = CallbackRecorder()
+    register_event_pricing_callbacks(app)
+    update_event_pricing = app.callbacks['update_event_pricing']
+    # Defaults of the Event Pricing form
+    args = (1, 100.0, 30.0, 0.0, 0.0, 7, 2, 1, 2.0, 90.0, 25.0)
+    outputs = benchmark(update_event_pricing, *args)
+    assert len(outputs) == 8  # the payoff chart is drawn clientside
@@ -0,0 +1,12 @@
+import datetime
+import pytest
+from app.execution import schedule_orders
+
+CUTOFF = datetime.datetime(2025, 4, 17, 16, 0)
+
+
+@pytest.mark.benchmark(group="schedule_orders")
+@pytest.mark.parametrize('style', ['VWAP', 'Inline'])
+def test_schedule_orders(benchmark, positions, style):
+    schedule = benchmark(schedule_orders, positions, style, CUTOFF)
+    assert schedule.shares.shape == (len(positions), 288)
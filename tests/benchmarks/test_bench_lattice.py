@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+from app.event_pricing import Lattice
+from .conftest import rounds_for
+
+S, T, R, Q, SIGMA = 100.0, 10 / 252, 0.05, 0.0, 0.30
+
+
+@pytest.mark.benchmark(group="lattice")
+@pytest.mark.parametrize('method', Lattice.METHODS)
+def test_lattice_american(benchmark, n_strikes, method):
+    strikes = np.linspace(75, 125, n_strikes)
+    lattice = Lattice(S, T, R, Q, sigma=SIGMA, method=method)
+    prices = benchmark.pedantic(lattice.price, args=(strikes, False), rounds=rounds_for(n_strikes))
+    assert prices.shape == (n_strikes,)
@@ -0,0 +1,23 @@
+import pytest
+from app.callbacks.hedging_callbacks import filter_positions
+from app.utils.data_loader import load_positions, compact_frame
+
+
+@pytest.mark.benchmark(group="load_positions")
+@pytest.mark.parametrize('compact', [False, True], ids=['raw', 'compact'])
+def test_load_positions(benchmark, positions_file, compact):
+    df = benchmark(load_positions, positions_file, compact)
+    assert not df.empty
+
+
+@pytest.mark.benchmark(group="hedge_filter")
+@pytest.mark.parametrize('compact', [False, True], ids=['raw', 'compact'])
+def test_filter_positions(benchmark, positions, compact):
+    df = compact_frame(positions) if compact else positions
+
+    def run():
+        # Same work as the hedge table callback: filter, then serialize for the DataTable
+        return filter_positions(df, 'US', ['Book1', 'Book2']).to_dict('records')
+
+    records = benchmark(run)
+    assert all(r['Market'] == 'US' for r in records)
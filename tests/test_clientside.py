@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from app.run import create_app
+
+ASSETS = os.path.join(os.path.dirname(__file__), '..', 'app', 'assets')
+
+
+def test_ui_callbacks_run_in_the_browser():
+    app = create_app()
+    # Clientside callbacks are listed in the callback map too, without a Python function
+    server_outputs = {output for key, spec in app.callback_map.items() if 'callback' in spec
+                      for output in key.strip('.').split('...')}
+    clientside = {output for spec in app._callback_list if spec.get('clientside_function')
+                  for output in spec['output'].strip('.').split('...')}
+    for output in ('collapse-research.is_open', 'collapse-execution.is_open', 'collapse-riskpnl.is_open',
+                   'output-straddle-payoff-chart.figure', 'download-schedule-link.href'):
+        assert output in clientside
+        assert output not in server_outputs
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_payoff_diagrams():
+    script = """
+    global.window = {dash_clientside: {no_update: 'no_update'}};
+    require(%s);
+    const p = window.dash_clientside.payoff;
+    const summary = [{'25Δ Put Strike': '90.5', '25Δ Call Strike': '110.0'}];
+    const k = p.strikes(100, summary);
+    const fig = p.chart(summary, 'risk_reversal', '100', {color: 'red', template: {}});
+    console.log(JSON.stringify({
+        k: k, straddle: [p.straddle(80, k), p.straddle(100, k)], strangle: [p.strangle(100, k), p.strangle(120, k)],
+        rr: [p.riskReversal(80, k), p.riskReversal(100, k), p.riskReversal(120, k)],
+        n: fig.data[0].x.length, title: fig.layout.title.text, empty: p.chart([], 'straddle', 100, {}),
+    }));
+    """ % json.dumps(os.path.abspath(os.path.join(ASSETS, 'payoff.js')))
+    out = json.loads(subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout)
+    assert out['k'] == {'atm': 100, 'put': 90.5, 'call': 110.0}
+    assert out['straddle'] == [20, 0]
+    assert out['strangle'] == [0, 10]
+    assert out['rr'] == [-10.5, 0, 10]
+    assert out['n'] == 100
+    assert out['title'] == 'Risk Reversal Payoff Diagram'
+    assert out['empty'] == 'no_update'
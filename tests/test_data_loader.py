@@ -0,0 +1,60 @@
+import os
+import numpy as np
+import pandas as pd
+from app.layouts.hedging_layout import hedging_layout
+from app.utils import data_loader
+from app.utils.data_loader import compact_frame, export_positions, format_pct, load_positions, parse_pct
+
+
+def test_parse_pct():
+    assert parse_pct(pd.Series(['+0.8%', '-0.5%', '100%'])).tolist() == [0.008, -0.005, 1.0]
+    assert format_pct(pd.Series([0.008, -0.005, 1.0])).tolist() == ['+0.8%', '-0.5%', '+100.0%']
+
+
+def test_compact_frame_is_lossless():
+    df = pd.DataFrame({
+        'Book': ['Book1', 'Book2', 'Book1', 'Book1'],
+        'Symbol': ['A', 'B', 'C', 'D'],
+        'Qty': np.array([1, -200, 30_000, 5], dtype=np.int64),
+        'Half': [0.5, 1.5, 0.0, -2.25],
+        'Spot': [26.72, 74.17, 55.51, 1.01],
+    })
+    out = compact_frame(df)
+    assert isinstance(out['Book'].dtype, pd.CategoricalDtype)
+    assert not isinstance(out['Symbol'].dtype, pd.CategoricalDtype)
+    assert out['Qty'].dtype == np.int16
+    assert out['Half'].dtype == np.float32
+    assert out['Spot'].dtype == np.float64  # not exact in float32
+    for col in df.columns:
+        assert out[col].tolist() == df[col].tolist()
+
+
+def test_load_positions_compact():
+    raw = load_positions()
+    compact = load_positions(compact=True)
+    assert compact['Spot % Move'].tolist() == parse_pct(raw['Spot % Move']).tolist()
+    assert compact['Delta$'].tolist() == raw['Delta$'].tolist()
+    assert compact.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum()
+    # The hedge table shows the parsed column as a signed percentage
+    table = hedging_layout(compact)['hedge-table']
+    assert next(c for c in table.columns if c['id'] == 'Spot % Move')['type'] == 'numeric'
+    # Exports (Download Orders) keep the file's format
+    assert export_positions(compact).to_csv(index=False) == raw.to_csv(index=False)
+
+
+def test_get_positions_reloads_when_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'positions.parquet'
+    raw = load_positions()
+    raw.to_parquet(path)
+    monkeypatch.setattr(data_loader, 'POSITIONS_PATH', str(path))
+    data_loader._positions.cache_clear()
+    try:
+        first = data_loader.get_positions()
+        assert data_loader.get_positions() is first
+        raw.head(3).to_parquet(path)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        second = data_loader.get_positions()
+        assert len(second) == 3
+        assert second.attrs['version'] != first.attrs['version']
+    finally:
+        data_loader._positions.cache_clear()
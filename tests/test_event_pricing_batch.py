@@ -0,0 +1,61 @@
+import time
+import multiprocessing
+import pytest
+from app.run import create_app
+from app.event_pricing import EventPricing, price_batch
+from app.event_pricing.batch import parse_underlying
+
+UNDERLYINGS = [
+    {"id": "AAA", "S0": 100.0, "ann_vol": 0.30},
+    {"id": "BBB", "S0": 55.0, "ann_vol": 0.45, "r": 0.03,
+     "event": {"normal_days": 4, "event_days": 1, "event_multiplier": 4.0, "prob_up": 0.4}},
+    {"id": "CCC", "S0": 230.0, "ann_vol": 0.20, "target_delta": 0.1},
+]
+
+
+def test_parse_underlying_rejects_bad_specs():
+    assert parse_underlying(UNDERLYINGS[1])['event_multiplier'] == 4.0
+    with pytest.raises(ValueError, match="Missing required field"):
+        parse_underlying({"id": "X", "S0": 100.0})
+    with pytest.raises(ValueError, match="Unknown fields"):
+        parse_underlying({"id": "X", "S0": 100.0, "ann_vol": 0.3, "event": {"jump": 1}})
+    with pytest.raises(ValueError, match="Non-numeric"):
+        parse_underlying({"id": "X", "S0": "abc", "ann_vol": 0.3})
+
+
+def test_price_batch_matches_event_pricing():
+    results = price_batch(UNDERLYINGS, max_workers=1)
+    assert [r['id'] for r in results] == ['AAA', 'BBB', 'CCC']
+    ep = EventPricing(S0=55.0, ann_vol=0.45, r=0.03, normal_days=4, event_days=1, event_multiplier=4.0, prob_up=0.4)
+    assert results[1]['summary'] == ep.summary().to_dict('records')
+    assert results[1]['premium_change'] == ep.premium_pct_change().to_dict('records')
+
+
+def test_price_batch_process_pool_keeps_order():
+    assert price_batch(UNDERLYINGS, max_workers=2, chunk_size=1, timeout=120) == price_batch(UNDERLYINGS, max_workers=1)
+
+
+def test_price_batch_timeout_stops_the_workers():
+    with pytest.raises(TimeoutError):
+        price_batch(UNDERLYINGS * 20, max_workers=2, chunk_size=1, timeout=0.01)
+    assert multiprocessing.active_children() == []
+    # Without a pool the deadline is checked between entries
+    with pytest.raises(TimeoutError):
+        price_batch(UNDERLYINGS, max_workers=1, timeout=0.0)
+
+
+def test_batch_endpoint():
+    client = create_app().server.test_client()
+    response = client.post('/api/event-pricing/batch', json={'underlyings': UNDERLYINGS[:1], 'chunk_size': 1})
+    assert response.status_code == 202
+    location = response.headers['Location']
+    deadline = time.monotonic() + 60
+    while (state := client.get(location).get_json())['status'] in ('queued', 'running'):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert state['status'] == 'done'
+    assert state['results'][0]['id'] == 'AAA'
+    assert client.get('/api/event-pricing/batch/' + '0' * 32).status_code == 404
+
+    response = client.post('/api/event-pricing/batch', json={'underlyings': [{"id": "X"}]})
+    assert response.status_code == 400
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from app.run import create_app
+from app.event_pricing import BlackScholes, EventPricing
+from app.event_pricing.sensitivity import sensitivities
+
+
+def test_delta_strike_matches_root_find():
+    for target_delta, call in ((0.25, True), (-0.25, False), (0.1, True)):
+        np.testing.assert_allclose(BlackScholes.delta_strike(100.0, 0.1, 0.05, 0.02, 0.3, target_delta, call),
+                                   BlackScholes.find_strike(100.0, 0.1, 0.05, 0.02, 0.3, target_delta, call), rtol=1e-9)
+
+
+@pytest.mark.parametrize('model', EventPricing.MODELS)
+def test_sensitivities_match_repricing(model):
+    ep = EventPricing(r=0.03, model=model)
+    table = sensitivities(ep, {'ann_vol': 0.02, 'event_days': 1, 'prob_up': 0.2})
+    assert len(table) == 3 * 6
+    row = table[(table['Parameter'] == 'ann_vol') & (table['Instrument'] == 'Post Straddle')].iloc[0]
+    up = EventPricing(r=0.03, ann_vol=0.32, model=model)
+    np.testing.assert_allclose(row['Up'], up.price_scenario(up.drifted_forward())['straddle'], rtol=1e-9)
+    np.testing.assert_allclose(row['Base'], ep.price_scenario(ep.drifted_forward())['straddle'])
+
+    # prob_up is clipped at 1; event_days down to 0 removes the event
+    row = table[(table['Parameter'] == 'prob_up') & (table['Instrument'] == 'Pre 25Δ Put')].iloc[0]
+    assert row['Δ Up'] == pytest.approx(0.0, abs=1e-9)  # the Pre scenario does not depend on prob_up
+    row = table[(table['Parameter'] == 'event_days') & (table['Instrument'] == 'Pre Straddle')].iloc[0]
+    down = EventPricing(r=0.03, event_days=0, model=model)
+    np.testing.assert_allclose(row['Down'], down.price_scenario(100.0)['straddle'], rtol=1e-9)
+
+    with pytest.raises(ValueError, match="Cannot bump"):
+        sensitivities(ep, {'S0': 1.0})
+    with pytest.raises(ValueError, match="whole days"):
+        sensitivities(ep, {'event_days': 0.5})
+
+    # A base valuation priced earlier (e.g. served from the snapshot) is reused as is
+    base = ep.summary().to_dict('records')
+    assert sensitivities(ep, {'ann_vol': 0.02, 'event_days': 1, 'prob_up': 0.2}, base=base).equals(table)
+
+
+def test_sensitivities_endpoint():
+    client = create_app().server.test_client()
+    response = client.post('/api/event-pricing/sensitivities',
+                           json={'underlying': {'id': 'AAA', 'S0': 100.0, 'ann_vol': 0.3}, 'bumps': {'ann_vol': 0.01}})
+    assert response.status_code == 200
+    assert {row['Parameter'] for row in response.get_json()['sensitivities']} == {'ann_vol'}
+
+    response = client.post('/api/event-pricing/sensitivities', json={'underlying': {'id': 'AAA', 'S0': 100.0}})
+    assert response.status_code == 400
@@ -0,0 +1,40 @@
+import datetime
+import numpy as np
+from app.event_pricing import EventPricing
+from app.event_pricing.batch import event_results
+from app.event_pricing.snapshot import EventPricingSnapshot, build_snapshot, event_pricing_results, latest_snapshot_path
+
+UNIVERSE = {
+    "underlyings": [{"id": "AAA", "S0": 100.0, "ann_vol": 0.30}, {"id": "BBB", "S0": 55.0, "ann_vol": 0.45}],
+    "presets": [
+        {"name": "default", "event": {"event_multiplier": 2.0, "prob_up": 0.9}},
+        {"name": "binary", "target_delta": 0.1, "event": {"event_multiplier": 4.0, "prob_up": 0.5}},
+    ],
+}
+
+
+def test_snapshot_serves_exact_matches(tmp_path):
+    path = build_snapshot(UNIVERSE, str(tmp_path), date=datetime.date(2025, 4, 17), max_workers=1)
+    build_snapshot(UNIVERSE, str(tmp_path), date=datetime.date(2025, 4, 16), max_workers=1)
+    assert latest_snapshot_path(str(tmp_path)) == path
+
+    snapshot = EventPricingSnapshot(path)
+    assert len(snapshot) == 4
+    params = dict(S0=55.0, ann_vol=0.45, event_multiplier=4.0, prob_up=0.5, target_delta=0.1)
+    results, hit = event_pricing_results(params, snapshot)
+    assert hit
+    live = event_results(EventPricing(**params), include_curves=True)
+    assert results['summary'] == live['summary']
+    assert results['iv_shift'] == live['iv_shift']
+    np.testing.assert_allclose(results['pdf']['implied'], live['pdf']['implied'])
+    np.testing.assert_allclose(results['skew']['iv_post'], live['skew']['iv_post'])
+
+
+def test_snapshot_falls_back_to_live_pricing(tmp_path):
+    snapshot = EventPricingSnapshot(build_snapshot(UNIVERSE, str(tmp_path), max_workers=1))
+    params = dict(S0=101.0, ann_vol=0.30)
+    assert snapshot.lookup(params) is None
+    results, hit = event_pricing_results(params, snapshot)
+    assert not hit
+    assert results['summary'] == event_results(EventPricing(**params))['summary']
+    assert event_pricing_results(params, None)[1] is False
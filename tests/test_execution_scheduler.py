@@ -0,0 +1,89 @@
+import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+import pytest
+from app.run import create_app
+from app.execution import STYLES, iter_schedule_csv, schedule_orders
+from app.execution.scheduler import MARKET_SESSIONS, volume_curve
+
+CUTOFF = datetime.datetime(2025, 4, 17, 16, 0)  # a Thursday
+ORDERS = pd.DataFrame({
+    'Symbol': ['AAA', 'BBB', 'CCC', 'DDD'],
+    'Market': ['US', 'HK', 'US', 'EU'],
+    'Target Exec Shrs': [100_000, -30_000, 1_000, 0],
+    'Max Buy': [1_500, 500, 500, 500],
+    'Max Sell': [400, 400, 400, 400],
+})
+
+
+def test_volume_curve():
+    curve = volume_curve(MARKET_SESSIONS['HK'])
+    assert curve.sum() == pytest.approx(1.0)
+    assert np.count_nonzero(curve) == (150 + 180) // 5
+    assert curve[12 * 12] == 0  # lunch break
+    assert curve[9 * 12 + 6] > curve[11 * 12]  # open heavier than midday
+
+
+@pytest.mark.parametrize('style', STYLES)
+def test_schedule_respects_caps_and_totals(style):
+    schedule = schedule_orders(ORDERS, style=style, cutoff=CUTOFF)
+    assert schedule.shares.shape == (4, 288)
+    target = ORDERS['Target Exec Shrs'].to_numpy()
+    np.testing.assert_array_equal(np.abs(schedule.shares).sum(axis=1) + schedule.unfilled, np.abs(target))
+    assert np.all(schedule.shares[0] <= 1_500) and np.all(schedule.shares[1] >= -400) and np.all(schedule.shares[1] <= 0)
+    # Nothing before the open or after the cutoff
+    traded = schedule.times[np.abs(schedule.shares).sum(axis=0) > 0]
+    assert traded.min() >= np.datetime64('2025-04-17T08:00') and traded.max() < np.datetime64(CUTOFF)
+
+
+def test_vwap_follows_volume_curve():
+    schedule = schedule_orders(ORDERS, style='VWAP', cutoff=CUTOFF)
+    # Uncapped order: children in proportion to the curve
+    curve = volume_curve(MARKET_SESSIONS['US'])
+    np.testing.assert_allclose(schedule.shares[2], 1_000 * curve, atol=1)
+    # Capped order: capped buckets at the cap, the excess moved to the midday buckets
+    assert schedule.unfilled[0] == 0 and schedule.shares[0].max() == 1_500
+    # 30k over 66 HK buckets at 400 max: capped everywhere, the rest is unfilled
+    assert schedule.unfilled[1] == 30_000 - 66 * 400
+
+    loc = schedule_orders(ORDERS, style='Limit on Close', cutoff=datetime.datetime(2025, 4, 17, 12, 30))
+    assert loc.times[np.nonzero(loc.shares[2])[0]] == [np.datetime64('2025-04-17T12:25')]
+    assert loc.times[np.nonzero(loc.shares[1])[0]] == [np.datetime64('2025-04-17T11:55')]  # HK lunch break
+
+
+def test_aware_start_and_cutoff_are_converted_per_market():
+    orders = ORDERS.assign(**{'Target Exec Shrs': [100_000, -30_000, 1_000, 1_000]})
+    cutoff = datetime.datetime(2025, 4, 17, 16, 0, tzinfo=ZoneInfo('America/New_York'))
+    now = datetime.datetime(2025, 4, 17, 14, 2, tzinfo=datetime.timezone.utc)  # 10:02 in New York, 15:02 in London
+    schedule = schedule_orders(orders, style='Inline', cutoff=cutoff, start=now)
+
+    def traded(row):
+        times = schedule.times[np.nonzero(schedule.shares[row])[0]]
+        return times.min(), times.max()
+    # The bucket under way at the start is skipped
+    assert traded(2) == (np.datetime64('2025-04-17T10:05'), np.datetime64('2025-04-17T15:55'))
+    assert traded(3) == (np.datetime64('2025-04-17T15:05'), np.datetime64('2025-04-17T16:25'))
+    assert schedule.unfilled[1] == 30_000  # Hong Kong is closed from now to the cutoff
+
+
+def test_streaming_export():
+    schedule = schedule_orders(ORDERS, style='Inline', cutoff=CUTOFF)
+    streamed = ''.join(iter_schedule_csv(ORDERS, chunk_rows=1, style='Inline', cutoff=CUTOFF))
+    assert streamed == ''.join(schedule.iter_csv())
+    lines = streamed.splitlines()
+    assert lines[0] == 'Symbol,Market,Time,Side,Shares,Status'
+    assert len(lines) == len(schedule) + len(schedule.unfilled_orders()) + 1
+    assert len(schedule.child_orders()) == len(schedule)
+    # 30k over 66 HK buckets at 400 max: the rest is reported
+    assert [line for line in lines if line.endswith(',Unfilled')] == ['BBB,HK,,Sell,3600,Unfilled']
+
+    client = create_app().server.test_client()
+    next_week = np.busday_offset(np.datetime64('today', 'D'), 5, roll='forward')
+    response = client.get(f'/api/hedging/schedule.csv?style=VWAP&date={next_week}&time=16:00&tz=Europe/Paris&market=US')
+    assert response.status_code == 200
+    assert {line.split(',')[1] for line in response.get_data(as_text=True).splitlines()[1:]} == {'US'}
+    assert client.get(f'/api/hedging/schedule.csv?style=TWAP&date={next_week}').status_code == 400
+    assert client.get(f'/api/hedging/schedule.csv?date={next_week}&tz=Mars/Olympus').status_code == 400
+    # The cutoff has passed
+    assert client.get('/api/hedging/schedule.csv?style=VWAP&date=2025-04-17&time=16:00').status_code == 400
@@ -0,0 +1,68 @@
+import json
+import plotly.graph_objects as go
+from app.run import create_app
+from app.utils.figures import LIGHT_TEMPLATE
+from app.utils.http_cache import LRUDict, request_key
+
+EVENT_PRICING_INPUTS = [
+    ('compute-btn', 'n_clicks', 1), ('input-s0', 'value', 100.0), ('input-ann-vol', 'value', 30.0),
+    ('input-r', 'value', 0.0), ('input-q', 'value', 0.0), ('input-normal-days', 'value', 7),
+    ('input-non-tdays', 'value', 2), ('input-event-days', 'value', 1), ('input-event-multiplier', 'value', 2.0),
+    ('input-prob-up', 'value', 90.0), ('input-target-delta', 'value', 25.0),
+]
+EVENT_PRICING_OUTPUTS = [
+    ('output-vol', 'children'), ('output-table', 'data'), ('output-table', 'columns'),
+    ('output-iv-chart', 'figure'), ('output-premium-chart', 'figure'), ('output-price-comp-chart', 'figure'),
+    ('output-skew-chart', 'figure'), ('output-distribution-chart', 'figure'),
+]
+
+
+def compute_request(n_clicks=1, s0=100.0):
+    values = {'compute-btn': n_clicks, 'input-s0': s0}
+    return {
+        'output': '..' + '...'.join(f'{i}.{p}' for i, p in EVENT_PRICING_OUTPUTS) + '..',
+        'outputs': [{'id': i, 'property': p} for i, p in EVENT_PRICING_OUTPUTS],
+        'inputs': [{'id': i, 'property': p, 'value': values.get(i, v)} for i, p, v in EVENT_PRICING_INPUTS],
+        'changedPropIds': ['compute-btn.n_clicks'],
+    }
+
+
+def test_request_key_ignores_click_count_only():
+    assert request_key(compute_request(1)) == request_key(compute_request(7))
+    assert request_key(compute_request(1)) != request_key(compute_request(1, s0=101.0))
+    assert request_key(compute_request(1), 'v1') != request_key(compute_request(1), 'v2')
+
+
+def test_lru_dict_evicts_least_recently_used():
+    cache = LRUDict(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and len(cache) == 2
+
+
+def test_trimmed_template_replaces_default_template():
+    fig = go.Figure(go.Bar(x=['a'], y=[1]))
+    fig.update_layout(template=LIGHT_TEMPLATE)
+    template = fig.to_plotly_json()['layout']['template']
+    assert 'polar' not in template['layout'] and set(template['data']) <= {'bar', 'scatter'}
+
+
+def test_compressed_response_and_not_modified():
+    client = create_app().server.test_client()
+    first = client.post('/_dash-update-component', json=compute_request(1), headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    etag = first.headers['ETag']
+
+    # Same inputs, next click: answered from the ETag cache without a body
+    second = client.post('/_dash-update-component', json=compute_request(2), headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+
+    # Different inputs: full response with a different ETag
+    third = client.post('/_dash-update-component', json=compute_request(3, s0=120.0), headers={'If-None-Match': etag})
+    assert third.status_code == 200
+    assert third.headers['ETag'] != etag
+    assert 'output-vol' in json.loads(third.data)['response']
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from app.event_pricing import BlackScholes, EventPricing, Lattice
+from app.event_pricing.lattice import price_lattices
+
+S, T, R, Q, SIGMA = 100.0, 0.5, 0.05, 0.01, 0.30
+STRIKES = np.linspace(80, 120, 9)
+
+
+@pytest.mark.parametrize('method', Lattice.METHODS)
+def test_european_matches_black_scholes(method):
+    lattice = Lattice(S, T, R, Q, sigma=SIGMA, method=method)
+    strikes = np.concatenate([STRIKES, STRIKES])
+    calls = np.repeat([True, False], len(STRIKES))
+    prices = lattice.price(strikes, calls, american=False)
+    expected = np.concatenate([BlackScholes.calc_price(S, STRIKES, T, R, Q, SIGMA, call=True),
+                               BlackScholes.calc_price(S, STRIKES, T, R, Q, SIGMA, call=False)])
+    np.testing.assert_allclose(prices, expected, atol=5e-4)
+
+
+def test_richardson_improves_coarse_trees():
+    lattice = Lattice(S, T, R, Q, sigma=SIGMA)
+    exact = BlackScholes.calc_price(S, STRIKES, T, R, Q, SIGMA, call=False)
+    plain = np.abs(lattice.price(STRIKES, False, american=False, steps=50, richardson=False) - exact).max()
+    extrapolated = np.abs(lattice.price(STRIKES, False, american=False, steps=50) - exact).max()
+    assert extrapolated < plain / 5
+
+
+def test_american_early_exercise():
+    lattice = Lattice(S, T, R, 0.0, sigma=SIGMA)
+    european = BlackScholes.calc_price(S, STRIKES, T, R, 0.0, SIGMA, call=False)
+    assert np.all(lattice.price(STRIKES, False) > european)
+    # Never optimal to exercise a call early without dividends
+    np.testing.assert_allclose(lattice.price(STRIKES, True), lattice.price(STRIKES, True, american=False), atol=1e-10)
+    # The reference is a fine tree without extrapolation
+    reference = Lattice(S, T, R, 0.0, sigma=SIGMA, method='trinomial').price(100.0, False, steps=2000, richardson=False)
+    np.testing.assert_allclose(lattice.price(100.0, False, steps=100), reference, atol=2e-3)
+
+
+def test_event_variance_schedule_and_dividends():
+    ep = EventPricing(S0=S, r=R)
+    lattice = Lattice(S, ep.T, R, variance_schedule=ep.variance_schedule())
+    np.testing.assert_allclose(lattice.price(STRIKES, True, american=False),
+                               BlackScholes.calc_price(S, STRIKES, ep.T, R, 0.0, ep.eff_vol, call=True), atol=5e-4)
+
+    lattice = Lattice(S, T, R, sigma=SIGMA, dividends=[(0.25, 2.0), (1.0, 5.0)])
+    escrowed = S - 2.0 * np.exp(-R * 0.25)
+    np.testing.assert_allclose(lattice.price(STRIKES, True, american=False),
+                               BlackScholes.calc_price(escrowed, STRIKES, T, R, 0.0, SIGMA, call=True), atol=5e-4)
+    assert np.all(lattice.price(STRIKES, True) >= lattice.price(STRIKES, True, american=False))
+
+
+def test_event_pricing_lattice_model():
+    with pytest.raises(ValueError, match="Unknown pricing model"):
+        EventPricing(model='monte_carlo')
+    bs = EventPricing(r=R).summary()
+    american = EventPricing(r=R, model='lattice').summary()
+    assert np.all(american['put_price'] > bs['put_price'])
+    np.testing.assert_allclose(american['call_price'], bs['call_price'], atol=1e-3)
+
+
+def test_dividends_apply_under_both_models():
+    dividends = [(3 / 252, 1.5)]
+    bs = EventPricing(r=R, dividends=dividends)
+    pre = bs.price_scenario(bs.S0)
+    assert pre['call_price'] < EventPricing(r=R).price_scenario(100.0)['call_price']
+    # Escrowed Black-Scholes is the European limit of the lattice
+    lattice = Lattice(bs.S0, bs.T, R, variance_schedule=bs.variance_schedule(), dividends=dividends)
+    np.testing.assert_allclose(lattice.price([pre['call_strike'], pre['put_strike']], [True, False], american=False),
+                               [pre['call_price'], pre['put_price']], atol=5e-4)
+    assert pre['forward'] == pytest.approx((100.0 - 1.5 * np.exp(-R * 3 / 252)) * np.exp(R * bs.T))
+
+
+def test_implied_vols_invert_against_the_escrowed_spot():
+    ep = EventPricing(dividends=[(3 / 252, 1.5)])
+    np.testing.assert_allclose(ep.iv_shift()['IV Pre (%)'], ep.eff_vol * 100, rtol=1e-4)
+    moneyness, ivs_pre, ivs_post = ep.skew(n_strikes=5)
+    np.testing.assert_allclose(ivs_pre, ep.eff_vol * 100, rtol=1e-4)
+
+
+@pytest.mark.parametrize('method', Lattice.METHODS)
+def test_batched_trees_match_single_trees(method):
+    lattices = [Lattice(S, T, R, Q, sigma=SIGMA, method=method),
+                Lattice(90.0, 0.25, 0.0, 0.0, sigma=0.5, dividends=[(0.1, 1.0)], method=method)]
+    strikes = np.array([[90.0, 100.0], [95.0, 80.0]])
+    prices = price_lattices(lattices, strikes, [False, True], steps=100)
+    for lattice, row, price in zip(lattices, strikes, prices):
+        np.testing.assert_allclose(price, lattice.price(row, [False, True], steps=100), rtol=1e-12)
@@ -0,0 +1,46 @@
+import random
+import threading
+from werkzeug.serving import make_server
+import importlib
+from app.run import create_app
+from app.utils.data_loader import load_positions
+from app.utils.load_test import BOOKS, callback_request, run_load, summarize, user_session
+
+
+def test_callback_request_format():
+    single = callback_request([('page-content', 'children')], [('subtab-hedging', 'n_clicks', 1)],
+                              changed=['subtab-hedging.n_clicks'])
+    assert single['output'] == 'page-content.children'
+    assert single['outputs'] == {'id': 'page-content', 'property': 'children'}
+    multi = callback_request([('a', 'x'), ('b', 'y')], [])
+    assert multi['output'] == '..a.x...b.y..'
+
+
+def test_sessions_replay_against_the_app():
+    app = create_app()
+    client = app.server.test_client()
+    for name, body in user_session(random.Random(0)):
+        response = client.post('/_dash-update-component', json=body)
+        assert response.status_code == 200, name
+
+
+def test_session_books_are_those_of_the_positions():
+    positions = load_positions()
+    layout = importlib.import_module('app.layouts.hedging_layout').hedging_layout(positions)
+    dropdown = next(c for c in layout._traverse() if getattr(c, 'id', None) == 'book-dropdown')
+    assert [option['value'] for option in dropdown.options] == BOOKS
+    assert set(BOOKS) <= set(positions['Book'].astype(str))
+
+
+def test_run_load_reports_every_callback():
+    server = make_server('127.0.0.1', 0, create_app().server, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        samples, wall = run_load(f'http://127.0.0.1:{server.port}', users=2, duration=3.0)
+    finally:
+        server.shutdown()
+    rows = {row['callback']: row for row in summarize(samples, wall)}
+    assert {'render_content', 'update_event_pricing'} <= set(rows)
+    assert rows['all']['errors'] == 0 and rows['all']['requests'] > 0
+    assert rows['all']['p50_ms'] <= rows['all']['p95_ms'] <= rows['all']['p99_ms']
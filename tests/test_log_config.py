@@ -0,0 +1,70 @@
+import sys
+import fcntl
+import json
+import types
+import logging
+from logging.handlers import QueueHandler
+from flask import Flask
+from app.utils import log_config
+from app.utils.log_config import setup_logging, stop_logging
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_as_json_with_request_context(tmp_path):
+    setup_logging(log_dir=str(tmp_path), log_file='test.log')
+    server = Flask(__name__)
+    with server.test_request_context(headers={'X-Request-ID': 'req-1'}):
+        logging.getLogger('test').info("hello %s", "world", extra={'duration_ms': 1.5})
+    stop_logging()
+
+    records = read_records(tmp_path / 'test.log')
+    assert records[-1]['message'] == 'hello world'
+    assert records[-1]['request_id'] == 'req-1'
+    assert records[-1]['duration_ms'] == 1.5
+
+
+def test_per_worker_files(tmp_path):
+    setup_logging(log_dir=str(tmp_path), log_file='test.log', rotation='time', per_worker=True)
+    logging.getLogger('test').warning("worker line")
+    stop_logging()
+
+    path = tmp_path / "test.0.log"
+    assert read_records(path)[-1]['level'] == 'WARNING'
+
+
+def test_per_worker_files_skip_slots_held_by_live_workers(tmp_path):
+    with open(tmp_path / ".test.0.lock", 'w') as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        setup_logging(log_dir=str(tmp_path), log_file='test.log', per_worker=True)
+        logging.getLogger('test').warning("worker line")
+        stop_logging()
+    assert (tmp_path / "test.1.log").exists()
+
+    # Once that worker has exited, its slot (and file) is reused
+    setup_logging(log_dir=str(tmp_path), log_file='test.log', per_worker=True)
+    logging.getLogger('test').warning("restarted worker line")
+    stop_logging()
+    assert read_records(tmp_path / "test.0.log")[-1]['message'] == "restarted worker line"
+
+
+def test_per_worker_files_by_default_under_gunicorn(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'gunicorn', types.ModuleType('gunicorn'))
+    setup_logging(log_dir=str(tmp_path), log_file='test.log')
+    logging.getLogger('test').warning("worker line")
+    stop_logging()
+
+    assert (tmp_path / "test.0.log").exists()
+    assert not (tmp_path / 'test.log').exists()
+
+
+def test_stop_detaches_the_queue(tmp_path):
+    setup_logging(log_dir=str(tmp_path), log_file='test.log')
+    stop_logging()
+    assert not any(isinstance(h, QueueHandler) for h in logging.getLogger().handlers)
+    # A fork after stop_logging must not bring the listener back
+    log_config._restart_listener_after_fork()
+    assert log_config._listener is None
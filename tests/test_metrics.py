@@ -0,0 +1,62 @@
+from app.run import create_app
+from app.utils.data_loader import load_positions
+from app.utils.metrics import Histogram, CALLBACK_WALL, record_cache, render_metrics
+
+
+OPEN_SCREENER = {
+    "output": "page-content.children",
+    "outputs": {"id": "page-content", "property": "children"},
+    "inputs": [{"id": f"subtab-{page}", "property": "n_clicks", "value": 1 if page == "screener" else None}
+               for page in ("screener", "backtester", "eventpricing", "hedging", "pnlanalytics")],
+    "changedPropIds": ["subtab-screener.n_clicks"],
+}
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram('test_seconds', 'Test histogram.', buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, callback='cb')
+    lines = h.render()
+    assert 'test_seconds_bucket{callback="cb",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{callback="cb",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{callback="cb",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{callback="cb"} 3' in lines
+
+
+def test_callbacks_are_timed_and_exposed_on_metrics_route():
+    app = create_app()
+    client = app.server.test_client()
+    before = CALLBACK_WALL._series.get((('callback', 'render_content'),), [0])[-1]
+
+    response = client.post('/_dash-update-component', json=OPEN_SCREENER)
+    assert response.status_code == 200
+    assert CALLBACK_WALL._series[(('callback', 'render_content'),)][-1] == before + 1
+
+    load_positions()
+    record_cache('test_cache', hit=True)
+    metrics = client.get('/metrics')
+    assert metrics.status_code == 200
+    body = metrics.data.decode()
+    assert 'dash_callback_cpu_seconds_count{callback="render_content"}' in body
+    assert 'dash_callback_response_bytes_count{callback="render_content"}' in body
+    assert 'data_loader_wall_seconds_count{loader="load_positions"}' in body
+    assert 'cache_requests_total{cache="test_cache",result="hit"} 1' in body
+
+
+def test_metrics_are_summed_across_worker_processes(tmp_path):
+    import json
+    import os
+    import subprocess
+    import sys
+
+    exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+    exited.wait()
+    series = {'cache_requests': [[[['cache', 'shared_cache'], ['result', 'hit']], 2]]}
+    for pid in (os.getppid(), exited.pid):  # a live worker and one that has exited
+        (tmp_path / f"{pid}.json").write_text(json.dumps(series))
+    record_cache('shared_cache', hit=True)
+
+    body = render_metrics(str(tmp_path))
+    assert 'cache_requests_total{cache="shared_cache",result="hit"} 5' in body
+    assert not (tmp_path / f"{exited.pid}.json").exists()  # folded into the archive
+    assert render_metrics(str(tmp_path)) == body
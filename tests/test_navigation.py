@@ -0,0 +1,52 @@
+import importlib
+import pandas as pd
+from dash import Dash, html
+from app.callbacks.navigation_callbacks import register_navigation_callbacks
+from app.utils.load_test import PAGES, callback_request
+
+# The module, not the function the package re-exports under the same name
+hedging_module = importlib.import_module('app.layouts.hedging_layout')
+
+
+def open_page(client, page):
+    inputs = [(p, 'n_clicks', 1 if p == page else None) for p in PAGES]
+    body = callback_request([('page-content', 'children')], inputs, changed=[f'{page}.n_clicks'])
+    response = client.post('/_dash-update-component', json=body)
+    assert response.status_code == 200
+    return response.get_json()['response']['page-content']['children']
+
+
+def find(component, id_):
+    if isinstance(component, dict):
+        if component.get('props', {}).get('id') == id_:
+            return component
+        return find(component.get('props', {}).get('children'), id_)
+    if isinstance(component, list):
+        return next((c for c in map(lambda child: find(child, id_), component) if c), None)
+    return None
+
+
+def test_page_layouts_are_built_once_per_data_version(monkeypatch):
+    positions = pd.DataFrame({'Symbol': ['A', 'B'], 'Delta$': [1.0, -2.0], 'Book': ['B1', 'B2'], 'Market': ['US', 'HK']})
+    positions.attrs['version'] = 'v1'
+    builds = []
+    build = hedging_module.hedging_layout
+    monkeypatch.setattr(hedging_module, 'hedging_layout', lambda df: builds.append(df) or build(df))
+
+    app = Dash(__name__, suppress_callback_exceptions=True)
+    app.layout = html.Div(id='page-content')
+    register_navigation_callbacks(app, lambda: positions)
+    client = app.server.test_client()
+
+    first = open_page(client, 'subtab-hedging')
+    open_page(client, 'subtab-eventpricing')
+    assert open_page(client, 'subtab-hedging') == first
+    assert len(builds) == 1
+    # The table starts empty: update_hedge_table loads the rows when it is shown
+    table = find(first, 'hedge-table')
+    assert table['props']['data'] == []
+    assert [c['id'] for c in table['props']['columns']] == list(positions.columns)
+
+    positions.attrs['version'] = 'v2'
+    open_page(client, 'subtab-hedging')
+    assert len(builds) == 2
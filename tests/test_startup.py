@@ -0,0 +1,27 @@
+import os
+import sys
+import subprocess
+from app.utils.startup_profile import ROOT_DIR, parse_importtime
+
+
+def test_lazy_startup_skips_heavy_modules():
+    code = ("import sys, app; app.server; "
+            "print(sorted(m for m in ('scipy', 'pandas', 'pyarrow') if m in sys.modules))")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True,
+                          check=True, env=dict(os.environ, APP_PRELOAD='0'))
+    assert proc.stdout.strip() == '[]'
+
+
+def test_preload_imports_heavy_modules():
+    code = ("import sys, app; app.server; "
+            "print(sorted(m for m in ('scipy.optimize', 'pyarrow.parquet', 'app.layouts') if m in sys.modules))")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True,
+                          check=True, env=dict(os.environ, APP_PRELOAD='1'))
+    assert proc.stdout.strip() == "['app.layouts', 'pyarrow.parquet', 'scipy.optimize']"
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   numpy.core\n"
+              "import time:        30 |        150 | numpy\n")
+    assert parse_importtime(stderr) == [('numpy.core', 120, 120), ('numpy', 30, 150)]